@@ -11,6 +11,62 @@ Spec References:
 """
 
 import os
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# cpu.stat is a handful of short "key value" lines; one page always covers it.
+_STAT_READ_SIZE = 4096
+
+# cgroup v2 always emits usage_usec as the first cpu.stat line
+_USAGE_KEY = b"usage_usec"
+
+
+class CpuStat(NamedTuple):
+    """
+    One snapshot of cpu.stat.
+    
+    Fields mirror the kernel keys. Keys absent from the file are None;
+    nothing is defaulted or inferred (O3).
+    """
+    usage_usec: int
+    user_usec: Optional[int] = None
+    system_usec: Optional[int] = None
+    nr_periods: Optional[int] = None
+    nr_throttled: Optional[int] = None
+    throttled_usec: Optional[int] = None
+
+
+# cpu.stat key -> CpuStat field; unknown keys are ignored
+_CPU_STAT_KEYS = {name.encode("ascii"): name for name in CpuStat._fields}
+
+
+def parse_cpu_stat(content: bytes, source: str = "cpu.stat") -> CpuStat:
+    """
+    Parse every known field of a cpu.stat file in a single pass.
+    
+    Args:
+        content: Raw file contents.
+        source: Description of where content came from (for errors).
+        
+    Returns:
+        CpuStat: Parsed counters.
+        
+    Raises:
+        ValueError: If usage_usec is missing or any known field is malformed.
+    """
+    values = {}
+    for line in content.splitlines():
+        # format: usage_usec 123456
+        key, _, value = line.partition(b" ")
+        name = _CPU_STAT_KEYS.get(key)
+        if name is not None:
+            values[name] = int(value)
+            
+    if "usage_usec" not in values:
+        raise ValueError(f"Could not find usage_usec in {source}")
+        
+    return CpuStat(**values)
+
 
 def read_cpu_usage(cgroup_path: str) -> int:
     """
@@ -33,15 +89,70 @@ def read_cpu_usage(cgroup_path: str) -> int:
     """
     stat_file = os.path.join(cgroup_path, "cpu.stat")
     
-    with open(stat_file, "r") as f:
-        for line in f:
-            if line.startswith("usage_usec"):
-                # format: usage_usec 123456
-                parts = line.split()
-                if len(parts) >= 2:
-                    return int(parts[1])
-                    
-    raise ValueError(f"Could not find usage_usec in {stat_file}")
+    with open(stat_file, "rb") as f:
+        return parse_cpu_stat(f.read(), stat_file).usage_usec
+
+
+def open_cpu_stat(cgroup_path: str) -> int:
+    """
+    Open a persistent read-only descriptor on cpu.stat.
+    
+    The descriptor is re-read from offset 0 on every observation, which
+    avoids a path lookup and open/close pair per window.
+    
+    Raises:
+        FileNotFoundError: If cpu.stat does not exist.
+        PermissionError: If cpu.stat cannot be opened.
+    """
+    return os.open(os.path.join(cgroup_path, "cpu.stat"), os.O_RDONLY)
+
+
+def read_cpu_usage_fd(fd: int) -> int:
+    """
+    Read current CPU usage in microseconds from an open cpu.stat descriptor.
+    
+    Args:
+        fd: Descriptor returned by open_cpu_stat().
+        
+    Returns:
+        int: Total CPU usage in microseconds.
+        
+    Raises:
+        ValueError: If usage_usec cannot be parsed.
+        OSError: For I/O errors.
+        
+    Invariant O2: Derived exclusively from cpu.stat:usage_usec.
+    """
+    # pread at offset 0 makes the kernel regenerate the file contents
+    buf = os.pread(fd, _STAT_READ_SIZE, 0)
+    
+    # Fast path: the first two whitespace-separated fields are the key and
+    # value; split stops there instead of scanning the rest of the file.
+    fields = buf.split(None, 2)
+    if len(fields) >= 2 and fields[0] == _USAGE_KEY:
+        try:
+            return int(fields[1])
+        except ValueError:
+            pass
+            
+    # Slow path: layout differs from the kernel's, scan every line
+    return parse_cpu_stat(buf, f"cpu.stat (fd {fd})").usage_usec
+
+
+def read_cpu_stat_fd(fd: int) -> CpuStat:
+    """
+    Read all cpu.stat counters from an open cpu.stat descriptor.
+    
+    One read serves every field, so additional metrics cost no extra I/O.
+    
+    Args:
+        fd: Descriptor returned by open_cpu_stat().
+        
+    Raises:
+        ValueError: If cpu.stat cannot be parsed.
+        OSError: For I/O errors.
+    """
+    return parse_cpu_stat(os.pread(fd, _STAT_READ_SIZE, 0), f"cpu.stat (fd {fd})")
 
 
 def write_cpu_quota(cgroup_path: str, quota_us: int | None, period_us: int) -> None:
@@ -67,8 +178,16 @@ def write_cpu_quota(cgroup_path: str, quota_us: int | None, period_us: int) -> N
         - quota_us>0 -> "<quota> <period>"
     """
     max_file = os.path.join(cgroup_path, "cpu.max")
+    value = _format_cpu_max(quota_us, period_us)
     
-    # Format the value string
+    # Write to file
+    # Note: cgroup writes are atomic, but we overwrite strictly
+    with open(max_file, "w") as f:
+        f.write(value)
+
+
+def _format_cpu_max(quota_us: int | None, period_us: int) -> str:
+    """Format the cpu.max value string (see write_cpu_quota for rules)."""
     if quota_us is None:
         quota_str = "max"
     else:
@@ -78,9 +197,61 @@ def write_cpu_quota(cgroup_path: str, quota_us: int | None, period_us: int) -> N
              raise ValueError(f"Invalid negative quota: {quota_us}")
         quota_str = str(quota_us)
         
-    value = f"{quota_str} {period_us}"
+    return f"{quota_str} {period_us}"
+
+
+@lru_cache(maxsize=256)
+def _encode_cpu_max(quota_us: int | None, period_us: int) -> bytes:
+    """
+    Encoded cpu.max value, memoized.
     
-    # Write to file
-    # Note: cgroup writes are atomic, but we overwrite strictly
-    with open(max_file, "w") as f:
-        f.write(value)
+    Policy only ever emits 0 or B per workload, so steady-state enforcement
+    hits a handful of entries and never re-formats the string.
+    """
+    return _format_cpu_max(quota_us, period_us).encode("ascii")
+
+
+class CpuQuotaWriter:
+    """
+    Persistent writer for a single cgroup's cpu.max.
+    
+    Holds one write descriptor for the writer's lifetime instead of
+    opening and closing cpu.max on every enforcement. The descriptor is
+    opened lazily on first write and released by close().
+    
+    Invariant E1: Use cpu.max exclusively.
+    Invariant E3: Idempotency (writing same value is safe).
+    """
+    
+    def __init__(self, cgroup_path: str):
+        """
+        Args:
+            cgroup_path: Absolute path to the cgroup directory.
+        """
+        self._max_file = os.path.join(cgroup_path, "cpu.max")
+        self._fd = None
+        
+    def write(self, quota_us: int | None, period_us: int) -> None:
+        """
+        Write CPU quota to cpu.max (same rules as write_cpu_quota).
+        
+        Raises:
+            FileNotFoundError: If cpu.max does not exist.
+            PermissionError: If cpu.max cannot be written.
+            ValueError: If quota_us is negative.
+            OSError: For other I/O errors.
+        """
+        data = _encode_cpu_max(quota_us, period_us)
+        
+        if self._fd is None:
+            self._fd = os.open(self._max_file, os.O_WRONLY)
+            
+        # Truncate + write at offset 0 is equivalent to open(..., "w").write()
+        os.ftruncate(self._fd, 0)
+        os.pwrite(self._fd, data, 0)
+        
+    def close(self) -> None:
+        """Release the cpu.max descriptor (re-opened on next write)."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -9,7 +9,9 @@ Spec References:
 - INVARIANTS.md O1 (Aggregated per window)
 """
 
-from .cpu import read_cpu_usage
+import os
+
+from .cpu import open_cpu_stat, read_cpu_usage_fd
 
 class WindowedObserver:
     """
@@ -23,6 +25,8 @@ class WindowedObserver:
     Invariant O1: Aggregated per window.
     """
     
+    __slots__ = ("_cgroup_path", "_last_usage_usec", "_stat_fd")
+    
     def __init__(self, cgroup_path: str):
         """
         Initialize observer.
@@ -32,13 +36,19 @@ class WindowedObserver:
         """
         self._cgroup_path = cgroup_path
         self._last_usage_usec = None
+        self._stat_fd = None
         
     def init_observation(self):
         """
         Initialize the observation baseline.
         Must be called once before the first window.
+        
+        Opens a persistent cpu.stat descriptor that is reused by every
+        subsequent measurement until close().
         """
-        self._last_usage_usec = read_cpu_usage(self._cgroup_path)
+        if self._stat_fd is None:
+            self._stat_fd = open_cpu_stat(self._cgroup_path)
+        self._last_usage_usec = read_cpu_usage_fd(self._stat_fd)
         
     def measure_window(self) -> int:
         """
@@ -54,7 +64,7 @@ class WindowedObserver:
         if self._last_usage_usec is None:
             raise RuntimeError("Observer not initialized. Call init_observation() first.")
             
-        current_usage = read_cpu_usage(self._cgroup_path)
+        current_usage = read_cpu_usage_fd(self._stat_fd)
         
         # Calculate delta
         U_w = current_usage - self._last_usage_usec
@@ -72,3 +82,15 @@ class WindowedObserver:
         self._last_usage_usec = current_usage
         
         return U_w
+        
+    def close(self):
+        """
+        Release the cpu.stat descriptor.
+        
+        The observer must be re-initialized with init_observation() before
+        measuring again.
+        """
+        if self._stat_fd is not None:
+            os.close(self._stat_fd)
+            self._stat_fd = None
+        self._last_usage_usec = None
@@ -8,15 +8,15 @@ Spec References:
 - ARCHITECTURE.md §3.4 (Orchestrator)
 """
 
-import time
 import logging
 from typing import Optional, Tuple
 
-from .cpu import write_cpu_quota
+from .cpu import CpuQuotaWriter
 from .observation import WindowedObserver
+from .timer import SleepWindowTimer, TimerfdWindowTimer
 from window import WindowOrchestrator
 from policy import PolicyStateData, DecisionRecord
-from json_logger import setup_json_logger, log_decision
+from json_logger import setup_json_logger, log_decision, flush_json_logger
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -26,7 +26,7 @@ class CgroupOrchestrator:
     Wall-clock driven orchestrator for cgroup v1 implementation.
     
     Responsibility:
-    - Triggers window advancement based on wall-clock time.
+    - Triggers window advancement from a window timer (cgroup.timer).
     - Measures drift but does NOT correct it dynamically (no adaptive sleep).
     - Prevents catch-up loops by strictly bounding lag.
     
@@ -35,7 +35,13 @@ class CgroupOrchestrator:
     Invariant T3: Bounded lag (sleep drift is observed, not dynamically corrected).
     """
     
-    def __init__(self, cgroup_path: str, B: int, W_us: int):
+    __slots__ = (
+        "_cgroup_path", "_B", "_W_us",
+        "_observer", "_enforcer", "_timer", "_policy_orch",
+        "_trace_logger", "_last_record", "_last_T_w",
+    )
+    
+    def __init__(self, cgroup_path: str, B: int, W_us: int, use_timerfd: bool = False):
         """
         Initialize orchestrator.
         
@@ -43,15 +49,20 @@ class CgroupOrchestrator:
             cgroup_path: Absolute path to cgroup.
             B: Budget in microseconds.
             W_us: Window size in microseconds.
+            use_timerfd: Schedule windows on a kernel timerfd instead of
+                sleeping (Linux, Python 3.13+).
         """
         self._cgroup_path = cgroup_path
         self._B = B
         self._W_us = W_us
-        self._W_sec = W_us / 1_000_000.0
         
         # Components
         self._observer = WindowedObserver(cgroup_path)
-        self._policy_orch = WindowOrchestrator(B, W_us)
+        self._enforcer = CpuQuotaWriter(cgroup_path)
+        self._timer = TimerfdWindowTimer(W_us) if use_timerfd else SleepWindowTimer(W_us)
+        # The loop runs indefinitely and only the last record is queried
+        # (get_status), so no per-window history is kept.
+        self._policy_orch = WindowOrchestrator(B, W_us, history=False)
         
         # v3: Structured Logging
         self._trace_logger = setup_json_logger(name="rgov.trace.v1", log_file="rgov_v1_trace.jsonl")
@@ -59,6 +70,10 @@ class CgroupOrchestrator:
         # v3: State Query
         self._last_record = None
         
+        # Last quota written to cpu.max. Writes are idempotent (E3), so an
+        # unchanged T_w is not rewritten. Reset by close().
+        self._last_T_w: Optional[int] = None
+        
     def run_loop(self, max_windows: Optional[int] = None) -> None:
         """
         Run the orchestration loop.
@@ -66,34 +81,58 @@ class CgroupOrchestrator:
         Args:
             max_windows: Optional limit on number of windows to process (for testing).
         """
-        # Init observation baseline
-        self._observer.init_observation()
-        
-        # Align next wake to valid monotonic future
-        next_wake = time.time() + self._W_sec
+        self.start()
         
-        windows_processed = 0
-        
-        while max_windows is None or windows_processed < max_windows:
-            # 1. Sleep until next window boundary
-            now = time.time()
-            sleep_duration = next_wake - now
-            
-            if sleep_duration > 0:
-                time.sleep(sleep_duration)
+        try:
+            self._timer.start()
             
-            # 2. Wake up and Measure
-            # Note: We measure strictly AFTER sleep
-            wake_time = time.time()
-            drift = wake_time - next_wake
+            windows_processed = 0
             
-            # bounded lag check (logging)
-            if drift > self._W_sec:
-                logger.warning(f"Major drift detected: {drift*1000:.2f}ms (> W)")
+            while max_windows is None or windows_processed < max_windows:
+                # 1. Sleep until next window boundary
+                expirations = self._timer.wait()
+                
+                # Drift is observed and reported, not corrected
+                drift_ns = self._timer.lag_ns
+                if drift_ns > self._W_us * 1000:
+                    logger.warning(f"Major drift detected: {drift_ns / 1_000_000:.2f}ms (> W)")
+                
+                # 2. Bounded lag: missed boundaries are skipped, not replayed
+                if expirations > 1:
+                    logger.warning(f"Lag implies {expirations - 1} skipped windows. Realigning.")
+                    
+                # 3. Measure -> Policy -> Enforce
+                self.process_window()
+                
+                windows_processed += 1
+        finally:
+            self.close()
             
+    def start(self) -> None:
+        """
+        Initialize the observation baseline.
+        
+        Must be called once before the first process_window(); run_loop
+        does this itself.
+        """
+        self._observer.init_observation()
+        
+    def process_window(self) -> DecisionRecord:
+        """
+        Run one Observation -> Policy -> Enforcement step.
+        
+        run_loop calls this once per window boundary. It performs no
+        sleeping or clock reads, so an external scheduler (e.g. a host
+        process that also serves a status endpoint) can drive windows
+        itself while keeping all execution synchronous.
+        
+        Returns:
+            DecisionRecord for the window just evaluated.
+        """
+        try:
             U_w = self._observer.measure_window()
             
-            # 3. Policy Evaluation
+            # Policy Evaluation
             next_state, decision, record = self._policy_orch.advance_window(U_w)
             
             # v3: Structured Logging
@@ -103,22 +142,30 @@ class CgroupOrchestrator:
             # v3: State Query
             self._last_record = record
             
-            # 4. Enforce
-            write_cpu_quota(self._cgroup_path, decision.T_w, self._W_us)
-            
-            windows_processed += 1
-            
-            # 5. Schedule Next
-            next_wake += self._W_sec
-            
-            # 6. Anti-Spin / Bounded Lag Logic
-            if next_wake < time.time():
-                lag = time.time() - next_wake
-                missed = int(lag / self._W_sec) + 1
-                if missed > 0:
-                    logger.warning(f"Lag implies {missed} skipped windows. Realigning.")
-                    next_wake += missed * self._W_sec
-                    
+            # Enforce (skip if the kernel already holds this quota)
+            if decision.T_w != self._last_T_w:
+                self._enforcer.write(decision.T_w, self._W_us)
+                self._last_T_w = decision.T_w
+        except BaseException:
+            # Keep the trace up to the failing window
+            flush_json_logger(self._trace_logger)
+            raise
+        
+        return record
+        
+    def close(self) -> None:
+        """
+        Release kernel file descriptors held by the observer, enforcer and timer,
+        and write out buffered trace records.
+        
+        Called automatically when run_loop exits; safe to call repeatedly.
+        """
+        self._observer.close()
+        self._enforcer.close()
+        flush_json_logger(self._trace_logger)
+        self._timer.close()
+        self._last_T_w = None
+        
     def get_status(self) -> Tuple[PolicyStateData, Optional[DecisionRecord]]:
         """
         Query current status (state and last decision).
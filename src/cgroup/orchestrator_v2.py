@@ -11,16 +11,20 @@ Spec Reference: v2.md, ARCHITECTURE.md
 v3.md (Observability)
 """
 
-import time
+import bisect
 import logging
+import time
 from typing import List, Optional, Tuple
 
 from workload import WorkloadID
 from policy_storage import PolicyStore
-from policy import evaluate_policy, initial_state, PolicyStateData, DecisionRecord
-from .cpu import write_cpu_quota
+from policy import (
+    initial_state, PolicyStateData, DecisionRecord, MODE_STATES, _policy_kernel, _policy_outputs
+)
+from .cpu import CpuQuotaWriter
 from .observation import WindowedObserver
-from json_logger import setup_json_logger, log_decision
+from .timer import SleepWindowTimer, TimerfdWindowTimer
+from json_logger import setup_json_logger, log_decision, flush_json_logger
 
 logger = logging.getLogger(__name__)
 
@@ -35,28 +39,55 @@ class MultiWorkloadOrchestrator:
     - T1 (Global Window): Single loop drives all workloads.
     """
     
-    def __init__(self, capacity_us: int, W_us: int):
+    __slots__ = (
+        "_capacity_us", "_W_us", "_policy_store", "_timer",
+        "_workloads", "_budgets", "_cgroups", "_observers", "_enforcers",
+        "_budget_total",
+        "_slot_wids", "_slot_budgets", "_slot_observers", "_slot_enforcers",
+        "_slot_rows", "_slot_last_T_w",
+        "_trace_logger", "_global_window_index",
+    )
+    
+    def __init__(self, capacity_us: int, W_us: int, use_timerfd: bool = False):
         """
         Initialize orchestrator.
         
         Args:
             capacity_us: Total physical capacity (microseconds).
             W_us: Window size (microseconds).
+            use_timerfd: Schedule windows on a kernel timerfd instead of
+                sleeping (Linux, Python 3.13+).
         """
         assert capacity_us > 0, f"Invalid capacity: {capacity_us}"
         assert W_us > 0, f"Invalid window size: {W_us}"
         
         self._capacity_us = capacity_us
         self._W_us = W_us
-        self._W_sec = W_us / 1_000_000.0
         
         self._policy_store = PolicyStore()
+        self._timer = TimerfdWindowTimer(W_us) if use_timerfd else SleepWindowTimer(W_us)
         
         # Registration state
         self._workloads: List[WorkloadID] = []
         self._budgets: dict[WorkloadID, int] = {}
         self._cgroups: dict[WorkloadID, str] = {}
         self._observers: dict[WorkloadID, WindowedObserver] = {}
+        self._enforcers: dict[WorkloadID, CpuQuotaWriter] = {}
+        
+        # Running sum of registered budgets (C1), kept incrementally so the
+        # capacity check is O(1) per registration.
+        self._budget_total = 0
+        
+        # Per-window slot arrays (struct-of-arrays), frozen by start().
+        # Slot i of every list belongs to the same workload, in iteration order.
+        self._slot_wids: List[WorkloadID] = []
+        self._slot_budgets: List[int] = []
+        self._slot_observers: List[WindowedObserver] = []
+        self._slot_enforcers: List[CpuQuotaWriter] = []
+        self._slot_rows: List[int] = []
+        # Last quota written per slot. Writes are idempotent (E3), so an
+        # unchanged T_w is not rewritten.
+        self._slot_last_T_w: List[Optional[int]] = []
         
         # v3: Structured Logging
         self._trace_logger = setup_json_logger(name="rgov.trace.v2", log_file="rgov_v2_trace.jsonl")
@@ -74,87 +105,167 @@ class MultiWorkloadOrchestrator:
         assert budget_us > 0, f"Invalid budget: {budget_us}"
         
         # Capacity Check
-        current_total = sum(self._budgets.values())
+        current_total = self._budget_total
         if current_total + budget_us > self._capacity_us:
             raise ValueError(f"Capacity exceeded: {current_total} + {budget_us} > {self._capacity_us}")
             
         # Register
-        self._workloads.append(wid)
+        # Keep workloads strictly sorted by ID for deterministic iteration order (Invariant: Order Independence)
+        # Note: WorkloadID is string-based NewType, so sortable.
+        bisect.insort(self._workloads, wid)
         self._budgets[wid] = budget_us
+        self._budget_total += budget_us
         self._cgroups[wid] = cgroup_path
         self._observers[wid] = WindowedObserver(cgroup_path)
+        self._enforcers[wid] = CpuQuotaWriter(cgroup_path)
         
         # Initialize state isolated
         self._policy_store.update_state(wid, initial_state())
         
-        # Sort workloads strictly by ID for deterministic iteration order (Invariant: Order Independence)
-        # Note: WorkloadID is string-based NewType, so sortable.
-        self._workloads.sort()
-        
     def run_loop(self, max_windows: Optional[int] = None) -> None:
         """
         Run the multi-workload orchestration loop.
         """
-        # Init observations
-        for wid in self._workloads:
-            self._observers[wid].init_observation()
-            
-        next_wake = time.time() + self._W_sec
-        
-        while max_windows is None or self._global_window_index < max_windows:
-            # 1. Sleep
-            now = time.time()
-            sleep_duration = next_wake - now
-            if sleep_duration > 0:
-                time.sleep(sleep_duration)
-                
-            # 2. Wake & Measure (All workloads)
-            # Iteration Invariant: Order doesn't matter for policy, solely for execution sequence.
-            # We iterate in sorted order.
+        self.start()
+        
+        try:
+            self._timer.start()
             
-            # Drift check
-            wake_time = time.time()
-            if wake_time - next_wake > self._W_sec:
-                logger.warning(f"Major drift > W")
+            while max_windows is None or self._global_window_index < max_windows:
+                # 1. Sleep until next window boundary
+                expirations = self._timer.wait()
                 
-            # Process each workload independently
-            for wid in self._workloads:
-                # A. Measure
-                observer = self._observers[wid]
-                state = self._policy_store.get_state(wid)
-                budget = self._budgets[wid]
+                # Drift is observed and reported, not corrected
+                if self._timer.lag_ns > self._W_us * 1000:
+                    logger.warning("Major drift > W")
                 
-                U_w = observer.measure_window()
+                # Anti-spin: missed boundaries are skipped, not replayed
+                if expirations > 1:
+                    logger.warning(f"Lag: skipped {expirations - 1} windows")
+                    
+                # 2. Measure -> Policy -> Enforce (All workloads)
+                self.process_window()
+        finally:
+            self.close()
+            
+    def start(self) -> None:
+        """
+        Initialize observation baselines for all registered workloads.
+        
+        Must be called once before the first process_window(); run_loop
+        does this itself. Also freezes the current workload order into the
+        per-slot arrays walked every window, so the hot path does no
+        per-workload dict lookups.
+        """
+        self._slot_wids = list(self._workloads)
+        self._slot_budgets = [self._budgets[wid] for wid in self._slot_wids]
+        self._slot_observers = [self._observers[wid] for wid in self._slot_wids]
+        self._slot_enforcers = [self._enforcers[wid] for wid in self._slot_wids]
+        self._slot_rows = [self._policy_store.row(wid) for wid in self._slot_wids]
+        self._slot_last_T_w = [None] * len(self._slot_wids)
+        
+        for observer in self._slot_observers:
+            observer.init_observation()
+            
+    def process_window(self) -> None:
+        """
+        Run one global window: Observation -> Policy -> Enforcement for
+        every workload, then advance the global window index.
+        
+        Performs no sleeping or scheduling clock reads (only the log
+        timestamp), so an external scheduler can drive windows itself
+        while keeping all execution synchronous.
+        """
+        # Iteration Invariant: Order doesn't matter for policy, solely for execution sequence.
+        # We iterate in sorted order.
+        try:
+            usages = self._measure_all()
+            
+            # Hot path: one fused policy pass over the slot arrays, with everything
+            # the loop body touches bound to locals (no per-workload dict lookup or
+            # repeated attribute resolution).
+            store = self._policy_store
+            trace_logger = self._trace_logger
+            window_index = self._global_window_index
+            quotas = []
+            
+            # One non-semantic log timestamp shared by every record of this window
+            timestamp = time.time()
+            
+            for row, budget, U_w in zip(self._slot_rows, self._slot_budgets, usages):
+                # B. Policy (evaluate_policy on the store's encoded columns)
+                assert U_w >= 0, f"Invalid input: U_w={U_w}"
+                mode = store.mode_at(row)
+                debt = store.debt_at(row)
+                new_mode, new_debt, T_w, rule = _policy_kernel(mode, debt, U_w, budget)
                 
-                # B. Policy
-                next_state, decision, record = evaluate_policy(
-                    state=state, 
-                    U_w=U_w, 
-                    B=budget, 
-                    W=self._W_us
-                )
-                self._policy_store.set_decision(wid, next_state, record)
+                # The start-of-window state is only reified for the DecisionRecord
+                state = PolicyStateData(mode=MODE_STATES[mode], debt_us=debt, last_decision_time=0.0)
+                _, _, record = _policy_outputs(state, U_w, budget, new_mode, new_debt, T_w, rule, True)
+                store.set_decision_at(row, new_mode, new_debt, record)
+                quotas.append(T_w)
                 
                 # v3: Logging
-                log_decision(self._trace_logger, record, override_window_index=self._global_window_index)
+                log_decision(trace_logger, record, override_window_index=window_index, timestamp=timestamp)
                 
-                # C. Enforce
-                write_cpu_quota(self._cgroups[wid], decision.T_w, self._W_us)
+            # C. Enforce
+            self._enforce_all(quotas)
                 
             # Increment global window
             self._global_window_index += 1
+        except BaseException:
+            # Keep the trace up to the failing window
+            flush_json_logger(self._trace_logger)
+            raise
             
-            # Schedule Next
-            next_wake += self._W_sec
+    def _measure_all(self) -> List[int]:
+        """
+        Sample every workload's usage back-to-back at the window boundary.
+        
+        All kernel reads happen in one tight pass before any policy or
+        enforcement work, so the samples are as close together as possible
+        (O1: sampled only at window boundaries) and the read loop carries
+        no interleaved logging or writes.
+        
+        Returns:
+            U_w per slot.
+        """
+        return [observer.measure_window() for observer in self._slot_observers]
+        
+    def _enforce_all(self, quotas: List[int]) -> None:
+        """
+        Apply every workload's decision back-to-back.
+        
+        Counterpart to _measure_all: all cpu.max writes happen in one tight
+        pass after policy, so every workload's new quota lands at nearly the
+        same instant and the write loop carries no interleaved logging.
+        Writes whose quota is unchanged are skipped (E3: idempotent).
+        
+        Args:
+            quotas: T_w per slot.
+        """
+        W_us = self._W_us
+        last_T_w = self._slot_last_T_w
+        
+        for slot, (enforcer, T_w) in enumerate(zip(self._slot_enforcers, quotas)):
+            if T_w != last_T_w[slot]:
+                enforcer.write(T_w, W_us)
+                last_T_w[slot] = T_w
+                
+    def close(self) -> None:
+        """
+        Release kernel file descriptors held by all observers, enforcers and the timer,
+        and write out buffered trace records.
+        
+        Called automatically when run_loop exits; safe to call repeatedly.
+        """
+        for wid in self._workloads:
+            self._observers[wid].close()
+            self._enforcers[wid].close()
+        flush_json_logger(self._trace_logger)
+        self._timer.close()
+        self._slot_last_T_w = [None] * len(self._slot_wids)
             
-            # Anti-spin
-            if next_wake < time.time():
-                lag = time.time() - next_wake
-                missed = int(lag / self._W_sec) + 1
-                if missed > 0:
-                    logger.warning(f"Lag: skipped {missed} windows")
-                    next_wake += missed * self._W_sec
-                    
     def get_status(self, workload_id: WorkloadID) -> Tuple[PolicyStateData, Optional[DecisionRecord]]:
         """
         Query current status (state and last decision) for a workload.
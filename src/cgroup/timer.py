@@ -0,0 +1,163 @@
+"""
+Window Timers (v1)
+
+This module implements window boundary scheduling for the orchestrators.
+
+Both timers share one interface: start() arms the first boundary one
+window from now, and wait() blocks until the next boundary and returns the
+number of boundaries elapsed since the previous wait (1 normally, more if
+windows were missed). Missed windows are skipped, never replayed. After
+each wait(), lag_ns reports how late wait() returned relative to the
+boundary it was waiting for (drift is observed, never corrected).
+
+- SleepWindowTimer sleeps on the monotonic clock (default, portable).
+- TimerfdWindowTimer lets the kernel deliver boundaries via timerfd.
+
+Spec References:
+- SPEC.md §3 (Time Model)
+- INVARIANTS.md T1 (Fixed Window), T3 (Bounded Lag)
+"""
+
+import os
+import sys
+import time
+
+
+def timerfd_available() -> bool:
+    """Return True if this interpreter exposes timerfd (Linux, Python 3.13+)."""
+    return hasattr(os, "timerfd_create")
+
+
+class SleepWindowTimer:
+    """
+    Window timer that sleeps on the monotonic clock until each boundary.
+
+    Invariant T1: Boundaries advance by the constant W.
+    Invariant T3: Bounded lag (overrun windows are skipped; drift is
+    observed, not dynamically corrected).
+    """
+
+    __slots__ = ("_W_ns", "_next_wake_ns", "_lag_ns")
+
+    def __init__(self, W_us: int):
+        """
+        Args:
+            W_us: Window size in microseconds.
+        """
+        # Integer nanoseconds: boundaries never accumulate float rounding.
+        self._W_ns = W_us * 1000
+        self._next_wake_ns = None
+        self._lag_ns = 0
+
+    @property
+    def lag_ns(self) -> int:
+        """Lateness of the last wait()'s return past its boundary, oversleep included (0 if on time)."""
+        return self._lag_ns
+
+    def start(self) -> None:
+        """Align the first boundary to one window from now."""
+        # Monotonic clock: wall-clock steps (NTP, settime) must not corrupt
+        # window boundaries or the anti-spin logic.
+        self._next_wake_ns = time.monotonic_ns() + self._W_ns
+
+    def wait(self) -> int:
+        """
+        Block until the next window boundary.
+
+        Returns:
+            int: Number of boundaries elapsed since the previous wait (>= 1).
+
+        Raises:
+            RuntimeError: If start() was not called.
+        """
+        if self._next_wake_ns is None:
+            raise RuntimeError("Timer not started. Call start() first.")
+
+        now_ns = time.monotonic_ns()
+
+        # Sleep until the boundary, then read the clock once more: drift is
+        # measured after waking, so oversleep is observed as well as overrun.
+        # A late wait skips the sleep and reuses its only read.
+        sleep_ns = self._next_wake_ns - now_ns
+        if sleep_ns > 0:
+            time.sleep(sleep_ns / 1_000_000_000)
+            now_ns = time.monotonic_ns()
+
+        # Lateness past the boundary just reached (never negative)
+        lag_ns = max(now_ns - self._next_wake_ns, 0)
+        self._lag_ns = lag_ns
+
+        # Anti-Spin / Bounded Lag: boundaries already passed are counted in
+        # a single divide and skipped; the next wake stays on the W grid
+        missed = lag_ns // self._W_ns
+        self._next_wake_ns += (missed + 1) * self._W_ns
+
+        return missed + 1
+
+    def close(self) -> None:
+        """Forget the schedule; start() must be called again."""
+        self._next_wake_ns = None
+
+
+class TimerfdWindowTimer:
+    """
+    Periodic window timer backed by timerfd(CLOCK_MONOTONIC).
+
+    Invariant T1: Armed once with a constant interval W.
+    Invariant T3: Missed boundaries are surfaced, never replayed.
+    """
+
+    __slots__ = ("_W_ns", "_fd", "_lag_ns")
+
+    def __init__(self, W_us: int):
+        """
+        Args:
+            W_us: Window size in microseconds.
+
+        Raises:
+            RuntimeError: If timerfd is not available on this platform.
+        """
+        if not timerfd_available():
+            raise RuntimeError("timerfd requires Linux and Python 3.13+")
+
+        self._W_ns = W_us * 1000
+        self._fd = None
+        self._lag_ns = 0
+
+    @property
+    def lag_ns(self) -> int:
+        """
+        Lateness of the last wait() past its scheduled boundary, in whole
+        windows (the kernel reports only the expiration count).
+        """
+        return self._lag_ns
+
+    def start(self) -> None:
+        """Arm the timer; the first boundary fires one window from now."""
+        if self._fd is None:
+            self._fd = os.timerfd_create(time.CLOCK_MONOTONIC, flags=os.TFD_CLOEXEC)
+        os.timerfd_settime_ns(self._fd, initial=self._W_ns, interval=self._W_ns)
+
+    def wait(self) -> int:
+        """
+        Block until the next window boundary.
+
+        Returns:
+            int: Number of boundaries elapsed since the previous wait (>= 1).
+                 Values above 1 mean windows were missed.
+
+        Raises:
+            RuntimeError: If start() was not called.
+        """
+        if self._fd is None:
+            raise RuntimeError("Timer not started. Call start() first.")
+
+        expirations = int.from_bytes(os.read(self._fd, 8), sys.byteorder)
+        self._lag_ns = (expirations - 1) * self._W_ns
+        return expirations
+
+    def close(self) -> None:
+        """Disarm and release the timer descriptor."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -6,12 +6,17 @@ This module provides generators for adversarial test sequences.
 These generators create pathological observation sequences to test
 policy correctness under extreme conditions per TESTING.md §5.
 
+Sequences are plain lists built by repeating a one- or two-element
+pattern (a single C-level allocation, no per-window Python loop).
+Consumers that keep long sequences, such as ReplayInput, pack them
+into int64 arrays themselves.
+
 Spec References:
 - TESTING.md §5 (Adversarial Testing Requirements)
 - v0.md §4 (Required Evidence)
 """
 
-from typing import List, Iterator
+from typing import List
 
 
 def generate_continuous_overshoot(B: int, overshoot_factor: float, num_windows: int) -> List[int]:
@@ -72,12 +77,7 @@ def generate_alternating_overshoot_undershoot(
     overshoot_U_w = int(B * overshoot_factor)
     undershoot_U_w = int(B * undershoot_factor)
     
-    result = []
-    for _ in range(num_cycles):
-        result.append(overshoot_U_w)
-        result.append(undershoot_U_w)
-    
-    return result
+    return [overshoot_U_w, undershoot_U_w] * num_cycles
 
 
 def generate_zero_usage(num_windows: int) -> List[int]:
@@ -157,11 +157,10 @@ def generate_long_debt_accumulation(
     accumulation_U_w = int(B * overshoot_factor)
     paydown_U_w = int(B * paydown_factor)
     
-    result = []
-    result.extend([accumulation_U_w] * accumulation_windows)
-    result.extend([paydown_U_w] * paydown_windows)
-    
-    return result
+    return (
+        [accumulation_U_w] * accumulation_windows +
+        [paydown_U_w] * paydown_windows
+    )
 
 
 def generate_oscillation(
@@ -196,9 +195,4 @@ def generate_oscillation(
     high_U_w = int(B * high_factor)
     low_U_w = int(B * low_factor)
     
-    result = []
-    for _ in range(num_oscillations):
-        result.append(high_U_w)
-        result.append(low_U_w)
-    
-    return result
+    return [high_U_w, low_U_w] * num_oscillations
@@ -9,15 +9,20 @@ Spec Reference: v3.md §2
 
 import json
 import logging
+import logging.handlers
 import time
 from dataclasses import asdict, is_dataclass
 from typing import Any
 from enum import Enum
 
-from policy import DecisionRecord
+from policy import DecisionRecord, PolicyStateData
 
 class JSONEncoder(json.JSONEncoder):
-    """Custom JSON Encoder for rgov types."""
+    """
+    Custom JSON Encoder for rgov types.
+    
+    Not used by log_decision, which pre-converts records to primitives.
+    """
     def default(self, o: Any) -> Any:
         if is_dataclass(o):
             return asdict(o)
@@ -25,13 +30,27 @@ class JSONEncoder(json.JSONEncoder):
             return o.value
         return super().default(o)
 
-def setup_json_logger(name: str = "rgov.trace", log_file: str = "rgov_trace.jsonl") -> logging.Logger:
+# Decision records buffered in memory before they are written to the file.
+# Keeps file I/O off most windows; flush_json_logger() drains the rest.
+TRACE_BUFFER_RECORDS = 64
+
+def setup_json_logger(
+    name: str = "rgov.trace", 
+    log_file: str = "rgov_trace.jsonl",
+    buffer_records: int = TRACE_BUFFER_RECORDS
+) -> logging.Logger:
     """
     Setup a logger that writes JSON lines.
     
+    Records are buffered and written in batches of `buffer_records`
+    (synchronously, on the logging call that fills the buffer). A record
+    at WARNING or above writes out the batch at once. Call
+    flush_json_logger() to write out a partial batch.
+    
     Args:
         name: Logger name.
         log_file: Path to log file.
+        buffer_records: Batch size; 1 writes every record immediately.
     """
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
@@ -42,33 +61,77 @@ def setup_json_logger(name: str = "rgov.trace", log_file: str = "rgov_trace.json
         handler = logging.FileHandler(log_file)
         formatter = logging.Formatter('%(message)s') # Raw message only (which will be JSON)
         handler.setFormatter(formatter)
+        
+        if buffer_records > 1:
+            handler = logging.handlers.MemoryHandler(
+                capacity=buffer_records,
+                flushLevel=logging.WARNING,
+                target=handler,
+                flushOnClose=True
+            )
         logger.addHandler(handler)
         
     return logger
 
+def flush_json_logger(logger: logging.Logger) -> None:
+    """
+    Write out any buffered records.
+    
+    Args:
+        logger: Logger returned by setup_json_logger().
+    """
+    for handler in logger.handlers:
+        handler.flush()
+
+def _state_dict(state: PolicyStateData) -> dict:
+    """PolicyStateData as JSON-ready primitives (mode as its string value)."""
+    return {
+        'mode': state.mode.value,
+        'debt_us': state.debt_us,
+        'last_decision_time': state.last_decision_time,
+    }
+
 def log_decision(
     logger: logging.Logger, 
     record: DecisionRecord,
-    override_window_index: int = None
+    override_window_index: int = None,
+    timestamp: float = None
 ) -> None:
     """
     Log a decision record as a JSON line.
     
-    Adds a non-semantic wall-clock timestamp.
-    """
-    data = asdict(record)
+    Adds a non-semantic wall-clock timestamp. Callers logging several
+    records for the same window may read the clock once and pass it as
+    `timestamp`; otherwise it is read per record.
     
-    # Inject window index if provided (authoritative source)
-    if override_window_index is not None:
-        data['window_index'] = override_window_index
+    Loggers from setup_json_logger() buffer records, so the last ones
+    only reach the file on flush_json_logger(). The orchestrators flush
+    in close() and when a window fails; code that drives log_decision
+    itself must call flush_json_logger() before it stops.
+    """
+    window_index = record.window_index if override_window_index is None else override_window_index
     
-    # Enum handling
-    # The JSONEncoder handles Enums in the dump
+    # Flat, field-by-field conversion (same keys and order as asdict, but no
+    # recursive deepcopy walk). Modes are reduced to plain strings so the C
+    # encoder serializes the whole dict without calling back into a Python
+    # default() hook.
+    data = {
+        'window_index': window_index,
+        'state_before': _state_dict(record.state_before),
+        'debt_before': record.debt_before,
+        'usage_us': record.usage_us,
+        'budget_us': record.budget_us,
+        'enforced_quota': record.enforced_quota,
+        'state_after': _state_dict(record.state_after),
+        'debt_after': record.debt_after,
+        'policy_rule_id': record.policy_rule_id,
+        'violated_invariant': record.violated_invariant,
+    }
     
     # Add non-semantic timestamp
-    data['timestamp'] = time.time()
+    data['timestamp'] = time.time() if timestamp is None else timestamp
     
     # Serialize
-    json_line = json.dumps(data, cls=JSONEncoder)
+    json_line = json.dumps(data, separators=(',', ':'))
     
     logger.info(json_line)
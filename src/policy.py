@@ -10,13 +10,30 @@ v3.md (Observability - DecisionRecord)
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Tuple
+from array import array
+from typing import Optional, Sequence, Tuple
 
 class PolicyState(str, Enum):
     NORMAL = "NORMAL"
     THROTTLED = "THROTTLED"
 
-@dataclass(frozen=True)
+
+# Integer encoding of PolicyState used by _policy_kernel and batch results
+MODE_NORMAL = 0
+MODE_THROTTLED = 1
+MODE_STATES = (PolicyState.NORMAL, PolicyState.THROTTLED)  # code -> PolicyState
+MODE_CODES = {PolicyState.NORMAL: MODE_NORMAL, PolicyState.THROTTLED: MODE_THROTTLED}  # PolicyState -> code
+
+# Rule table indexed by the kernel's rule code: (policy_rule_id, violated_invariant)
+_RULE_N1, _RULE_N2, _RULE_T1, _RULE_T2 = range(4)
+_RULES = (
+    ("RULE_N1_UNDER_BUDGET", None),
+    ("RULE_N2_OVER_BUDGET", "INV_USAGE_EXCEEDS_BUDGET"),
+    ("RULE_T1_DEBT_RECOVERED", None),
+    ("RULE_T2_STILL_IN_DEBT", "INV_DEBT_REMAINING"),
+)
+
+@dataclass(frozen=True, slots=True)
 class PolicyStateData:
     """
     Pure data container for policy state.
@@ -39,7 +56,7 @@ class PolicyStateData:
     def debt(self) -> int:
         return self.debt_us
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EnforcementDecision:
     """
     Output of the policy function.
@@ -49,7 +66,7 @@ class EnforcementDecision:
     """
     T_w: int
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DecisionRecord:
     """
     Structural record of a policy decision.
@@ -77,17 +94,23 @@ class DecisionRecord:
     violated_invariant: Optional[str] = None
 
 
+# PolicyStateData is frozen, so one shared instance serves every caller
+_INITIAL_STATE = PolicyStateData(mode=PolicyState.NORMAL, debt_us=0, last_decision_time=0.0)
+
+
 def initial_state() -> PolicyStateData:
-    """Create initial policy state (Normal, 0 debt)."""
-    return PolicyStateData(mode=PolicyState.NORMAL, debt_us=0, last_decision_time=0.0)
+    """Initial policy state (Normal, 0 debt). Returns a shared immutable instance."""
+    return _INITIAL_STATE
 
 
 def evaluate_policy(
     state: PolicyStateData, 
     U_w: int, 
     B: int, 
-    W: int
-) -> Tuple[PolicyStateData, EnforcementDecision, DecisionRecord]:
+    W: int,
+    *,
+    record: bool = True
+) -> Tuple[PolicyStateData, EnforcementDecision, Optional[DecisionRecord]]:
     """
     Pure policy function.
     
@@ -96,65 +119,53 @@ def evaluate_policy(
         U_w: Measured usage in previous window.
         B: Target budget.
         W: Window size (physical).
+        record: Build the DecisionRecord. Callers that never read it
+            (no logging or status) pass False to skip the allocation.
         
     Returns:
-        (NewState, EnforcementDecision, DecisionRecord)
+        (NewState, EnforcementDecision, DecisionRecord), with None in
+        place of the record when record=False.
     """
     # Validate inputs (Assertion P1/P2 guards)
     assert U_w >= 0, f"Invalid input: U_w={U_w}"
     assert B > 0, f"Invalid input: B={B}"
     
-    state_mode = state.mode
+    mode, new_debt, enforced, rule = _policy_kernel(
+        MODE_CODES[state.mode], state.debt_us, U_w, B
+    )
     
-    # 1. Calculate inputs
-    excess = U_w - B
+    return _policy_outputs(state, U_w, B, mode, new_debt, enforced, rule, record)
+
+
+def _policy_outputs(
+    state: PolicyStateData,
+    U_w: int,
+    B: int,
+    mode: int,
+    new_debt: int,
+    enforced: int,
+    rule: int,
+    record: bool
+) -> Tuple[PolicyStateData, EnforcementDecision, Optional[DecisionRecord]]:
+    """
+    Reify one _policy_kernel transition as evaluate_policy's return value.
     
-    # 2. Transition Logic
-    # Rule: Normal Mode
-    if state_mode == PolicyState.NORMAL:
-        if excess <= 0:
-            # Rule N1: Under-budget. No change.
-            new_debt = 0 
-            new_mode = PolicyState.NORMAL
-            enforced = B
-            rule_id = "RULE_N1_UNDER_BUDGET"
-            invariant = None
-        else:
-            # Rule N2: Over-budget. 
-            new_debt = excess
-            new_mode = PolicyState.THROTTLED
-            enforced = 0
-            rule_id = "RULE_N2_OVER_BUDGET"
-            invariant = "INV_USAGE_EXCEEDS_BUDGET"
-            
-    # Rule: Throttled Mode
-    else: # THROTTLED
-        repayment = B - U_w
-        new_debt = state.debt_us - repayment
-        
-        if new_debt <= 0:
-            # Rule T1: Debt Recovered
-            new_debt = 0
-            new_mode = PolicyState.NORMAL
-            enforced = B
-            rule_id = "RULE_T1_DEBT_RECOVERED"
-            invariant = None
-        else:
-            # Rule T2: Still in Debt
-            new_mode = PolicyState.THROTTLED
-            enforced = 0
-            rule_id = "RULE_T2_STILL_IN_DEBT"
-            invariant = "INV_DEBT_REMAINING"
-            
-    # 3. Construct Output
+    Shared by evaluate_policy and callers that step _policy_kernel on
+    their own integer state (WindowOrchestrator).
+    """
+    # Construct Output
     next_state = PolicyStateData(
-        mode=new_mode,
+        mode=MODE_STATES[mode],
         debt_us=new_debt,
         last_decision_time=0.0 
     )
     decision = EnforcementDecision(T_w=enforced)
     
-    record = DecisionRecord(
+    if not record:
+        return next_state, decision, None
+    
+    rule_id, invariant = _RULES[rule]
+    decision_record = DecisionRecord(
         window_index=None, 
         state_before=state,
         debt_before=state.debt_us,
@@ -167,4 +178,87 @@ def evaluate_policy(
         violated_invariant=invariant
     )
     
-    return next_state, decision, record
+    return next_state, decision, decision_record
+
+
+def _policy_kernel(mode: int, debt_us: int, U_w: int, B: int) -> Tuple[int, int, int, int]:
+    """
+    Arithmetic core of the policy: one transition on plain integers.
+    
+    Operates on encoded scalars only (no dataclass construction), so bulk
+    callers can step the state machine without allocating per window.
+    Inputs are not validated here; evaluate_policy is the checked entry point.
+    
+    Args:
+        mode: Encoded mode (MODE_NORMAL or MODE_THROTTLED).
+        debt_us: Debt before the window.
+        U_w: Measured usage in the window.
+        B: Target budget.
+        
+    Returns:
+        (new_mode, new_debt_us, T_w, rule) where rule indexes _RULES.
+    """
+    # 1. Calculate inputs
+    excess = U_w - B
+    
+    # 2. Transition Logic
+    # Rule: Normal Mode
+    if mode == MODE_NORMAL:
+        if excess <= 0:
+            # Rule N1: Under-budget. No change.
+            return MODE_NORMAL, 0, B, _RULE_N1
+        # Rule N2: Over-budget.
+        return MODE_THROTTLED, excess, 0, _RULE_N2
+        
+    # Rule: Throttled Mode
+    repayment = B - U_w
+    new_debt = debt_us - repayment
+    if new_debt <= 0:
+        # Rule T1: Debt Recovered
+        return MODE_NORMAL, 0, B, _RULE_T1
+    # Rule T2: Still in Debt
+    return MODE_THROTTLED, new_debt, 0, _RULE_T2
+
+
+def evaluate_policy_batch(
+    state: PolicyStateData,
+    observations: Sequence[int],
+    B: int
+) -> Tuple[array, array, array]:
+    """
+    Pure policy function applied to a whole observation sequence.
+    
+    Equivalent to folding evaluate_policy over `observations` starting at
+    `state`, but runs the integer kernel in one tight loop and returns
+    packed per-window columns instead of dataclasses.
+    
+    Args:
+        state: State before the first window.
+        observations: U_w per window.
+        B: Target budget.
+        
+    Returns:
+        (modes, debts_us, T_ws): state code ('b', see MODE_STATES) and
+        debt after each window, and the quota enforced for the next window.
+    """
+    # Validate inputs once for the whole sequence (Assertion P1/P2 guards)
+    assert B > 0, f"Invalid input: B={B}"
+    assert not observations or min(observations) >= 0, \
+        f"Invalid input: U_w={min(observations)}"
+    
+    n = len(observations)
+    modes = array('b', [0]) * n
+    debts = array('q', [0]) * n
+    T_ws = array('q', [0]) * n
+    
+    kernel = _policy_kernel
+    mode = MODE_CODES[state.mode]
+    debt = state.debt_us
+    
+    for i, U_w in enumerate(observations):
+        mode, debt, T_w, _ = kernel(mode, debt, U_w, B)
+        modes[i] = mode
+        debts[i] = debt
+        T_ws[i] = T_w
+        
+    return modes, debts, T_ws
@@ -5,54 +5,110 @@ This module implements the isolated storage for policy state per workload.
 Spec Reference: v2.md §3 (State Isolation)
 """
 
-from typing import Dict, Optional, Tuple
+from array import array
+from typing import Dict, List, Optional
 from workload import WorkloadID
-from policy import PolicyStateData, DecisionRecord, initial_state
+from policy import PolicyStateData, DecisionRecord, MODE_STATES, MODE_CODES, MODE_NORMAL
+
+# Largest debt an int64 column holds. Debt is unbounded in the policy, but
+# reaching this takes ~292k years of overshoot, so stored debt saturates
+# here rather than overflowing the column.
+DEBT_MAX_US = 2**63 - 1
 
 class PolicyStore:
     """
     Container for per-workload policy state.
     
+    State is stored column-wise: each workload owns one row of packed
+    mode/debt/timestamp arrays, located through an id -> row index.
+    PolicyStateData objects are built on demand by get_state(); hot
+    loops instead resolve row() once and use the *_at(row) accessors.
+    
     Invariant I2: State is strictly per-workload.
     Invariant I3: No shared state between entries.
     """
     
     def __init__(self):
-        self._states: Dict[WorkloadID, PolicyStateData] = {}
-        self._last_records: Dict[WorkloadID, Optional[DecisionRecord]] = {}
+        self._index: Dict[WorkloadID, int] = {}
+        self._modes = array('b')   # MODE_STATES code
+        self._debts = array('q')   # debt_us
+        self._times = array('d')   # last_decision_time
+        self._last_records: List[Optional[DecisionRecord]] = []
+        
+    def row(self, workload_id: WorkloadID) -> int:
+        """Row of a workload, appending a fresh (Normal, 0 debt) row if new. Rows never move."""
+        row = self._index.get(workload_id)
+        if row is None:
+            row = len(self._last_records)
+            self._index[workload_id] = row
+            self._modes.append(MODE_NORMAL)
+            self._debts.append(0)
+            self._times.append(0.0)
+            self._last_records.append(None)
+        return row
+        
+    def _write(self, row: int, state: PolicyStateData) -> None:
+        self._modes[row] = MODE_CODES[state.mode]
+        self._debts[row] = min(state.debt_us, DEBT_MAX_US)
+        self._times[row] = state.last_decision_time
+        
+    def mode_at(self, row: int) -> int:
+        """MODE_STATES code stored in a row (see row())."""
+        return self._modes[row]
+    
+    def debt_at(self, row: int) -> int:
+        """debt_us stored in a row (see row())."""
+        return self._debts[row]
+    
+    def set_decision_at(self, row: int, mode: int, debt_us: int, record: DecisionRecord) -> None:
+        """
+        Column-level set_decision for a row (see row()): stores an encoded
+        _policy_kernel result without building a PolicyStateData.
+        """
+        self._modes[row] = mode
+        self._debts[row] = min(debt_us, DEBT_MAX_US)
+        self._times[row] = 0.0
+        self._last_records[row] = record
         
     def get_state(self, workload_id: WorkloadID) -> PolicyStateData:
         """
         Retrieve state for a workload. 
         If not present, initializes new state (Normal, 0 debt).
         """
-        if workload_id not in self._states:
-            self._states[workload_id] = initial_state()
-            self._last_records[workload_id] = None
-        return self._states[workload_id]
+        row = self.row(workload_id)
+        return PolicyStateData(
+            mode=MODE_STATES[self._modes[row]],
+            debt_us=self._debts[row],
+            last_decision_time=self._times[row]
+        )
         
     def get_last_record(self, workload_id: WorkloadID) -> Optional[DecisionRecord]:
         """
         Retrieve the last decision record for a workload.
         """
-        if workload_id not in self._last_records:
+        row = self._index.get(workload_id)
+        if row is None:
             return None
-        return self._last_records[workload_id]
+        return self._last_records[row]
 
     def update_state(self, workload_id: WorkloadID, state: PolicyStateData) -> None:
         """
         Update state for a workload (without record).
         """
-        self._states[workload_id] = state
+        self._write(self.row(workload_id), state)
 
     def set_decision(self, workload_id: WorkloadID, state: PolicyStateData, record: DecisionRecord) -> None:
         """
         Update state and record for a workload after a decision.
         """
-        self._states[workload_id] = state
-        self._last_records[workload_id] = record
+        row = self.row(workload_id)
+        self._write(row, state)
+        self._last_records[row] = record
         
     def reset(self, workload_id: WorkloadID) -> None:
         """Reset state for a workload (e.g. on deregistration or explicit reset)."""
-        self._states[workload_id] = initial_state()
-        self._last_records[workload_id] = None
+        row = self.row(workload_id)
+        self._modes[row] = MODE_NORMAL
+        self._debts[row] = 0
+        self._times[row] = 0.0
+        self._last_records[row] = None
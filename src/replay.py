@@ -12,10 +12,11 @@ Spec References:
 - INVARIANTS.md G1, G2 (Determinism, Replayability)
 """
 
-from typing import List
+from array import array
+from typing import Optional, Sequence
 from dataclasses import dataclass
 
-from window import WindowOrchestrator, WindowRecord
+from window import WindowOrchestrator, WindowRecord, HistoryColumns
 
 
 @dataclass(frozen=True)
@@ -24,17 +25,42 @@ class ReplayInput:
     Input for replay harness per SPEC.md §6.1
     
     Contains all information needed to reproduce policy decisions.
+    Any sequence of ints is accepted as `observations`; it is stored as a
+    packed int64 copy (array('q')), which compares, indexes and iterates
+    like the original. `strict` is passed on to the WindowOrchestrator (see there); set it
+    to False to skip per-window output checks when replaying long,
+    already-verified traces.
     """
     B: int  # declared budget (microseconds)
     W: int  # enforcement window size (symbolic constant, microseconds)
-    observations: List[int]  # sequence of U_w observations
+    observations: Sequence[int]  # sequence of U_w observations; stored as array('q')
+    strict: bool = True
     
     def __post_init__(self):
         assert self.B > 0, f"Invalid budget: B={self.B}"
         assert self.W > 0, f"Invalid window size: W={self.W}"
+        
+        # Pack once into a private int64 copy: 8 bytes per window instead of
+        # a boxed int, immune to later changes to the caller's sequence, and
+        # copied straight into the history columns by replay()
+        try:
+            packed = array('q', self.observations)
+        except (TypeError, OverflowError):
+            # Not an int, or outside int64: report it like a negative U_w
+            raise AssertionError(_invalid_observation_message(self.observations)) from None
+        object.__setattr__(self, "observations", packed)
+        
         assert len(self.observations) > 0, "Empty observation sequence"
-        for i, U_w in enumerate(self.observations):
-            assert U_w >= 0, f"Invalid observation at index {i}: U_w={U_w}"
+        # One C-level scan; the offending index is only located on failure
+        assert min(self.observations) >= 0, _invalid_observation_message(self.observations)
+
+
+def _invalid_observation_message(observations: Sequence[int]) -> str:
+    """Describe the first observation that is not a non-negative int64 (assertion message)."""
+    for i, U_w in enumerate(observations):
+        if not isinstance(U_w, int) or not 0 <= U_w < 2**63:
+            return f"Invalid observation at index {i}: U_w={U_w}"
+    return "Invalid observation"
 
 
 @dataclass(frozen=True)
@@ -43,8 +69,11 @@ class ReplayOutput:
     Output from replay harness.
     
     Contains complete history of policy decisions for verification.
+    `columns`, when present, holds the same history in columnar form
+    (read-only, so outputs can be shared safely).
     """
-    history: List[WindowRecord]
+    history: Sequence[WindowRecord]
+    columns: Optional[HistoryColumns] = None
     
     def __post_init__(self):
         assert len(self.history) > 0, "Empty history"
@@ -74,15 +103,19 @@ def replay(replay_input: ReplayInput) -> ReplayOutput:
         - No signal timing
     """
     # Create orchestrator with declared budget and window size
-    orchestrator = WindowOrchestrator(B=replay_input.B, W=replay_input.W)
-    
-    # Replay each observation
-    for U_w in replay_input.observations:
-        orchestrator.advance_window(U_w)
-    
-    # Return complete history
-    history = orchestrator.get_history()
-    return ReplayOutput(history=history)
+    orchestrator = WindowOrchestrator(B=replay_input.B, W=replay_input.W, strict=replay_input.strict)
+    
+    # Replay every observation in one batched pass
+    orchestrator.run_batch(replay_input.observations)
+    
+    # Return complete history. The orchestrator is discarded here, so the
+    # columns can wrap its own buffers as read-only views instead of copies
+    # (views pin the arrays' size, which is safe once nothing advances).
+    columns = orchestrator._history_columns()
+    return ReplayOutput(
+        history=orchestrator.get_history(),
+        columns=HistoryColumns(*(memoryview(column).toreadonly() for column in columns))
+    )
 
 
 def verify_replay_determinism(
@@ -107,21 +140,27 @@ def verify_replay_determinism(
     """
     assert num_runs >= 2, f"Need at least 2 runs to verify determinism, got {num_runs}"
     
-    # Run replay multiple times
-    outputs = [replay(replay_input) for _ in range(num_runs)]
+    # Replay once for reference, then compare each further run as soon as it
+    # is produced: only two outputs are alive at a time, and the first
+    # mismatch ends the check
+    first_output = replay(replay_input)
     
-    # Verify all outputs are identical
-    first_output = outputs[0]
-    for i, output in enumerate(outputs[1:], start=1):
-        if len(first_output.history) != len(output.history):
+    for _ in range(num_runs - 1):
+        if not _identical_history(first_output, replay(replay_input)):
             return False
-        
-        for window_idx, (record1, record2) in enumerate(zip(first_output.history, output.history)):
-            # Compare all fields
-            if (record1.window_index != record2.window_index or
-                record1.state != record2.state or
-                record1.U_w != record2.U_w or
-                record1.T_w != record2.T_w):
-                return False
     
     return True
+
+
+def _identical_history(output1: ReplayOutput, output2: ReplayOutput) -> bool:
+    """Whether two replay outputs record the same windows."""
+    # Fast path: whole-column comparisons (one C-level loop per column)
+    if output1.columns is not None and output2.columns is not None:
+        return output1.columns == output2.columns
+    
+    if len(output1.history) != len(output2.history):
+        return False
+    
+    # Compare all fields: WindowRecord equality compares the field tuples,
+    # which short-circuits on identity (PolicyState members are singletons)
+    return not any(record1 != record2 for record1, record2 in zip(output1.history, output2.history))
@@ -11,13 +11,19 @@ Spec References:
 - INVARIANTS.md §3 (Time Invariants)
 """
 
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import List, Tuple
+from itertools import islice
+from typing import Iterator, NamedTuple, Tuple, Union
 
-from policy import PolicyStateData, EnforcementDecision, evaluate_policy, initial_state
+from policy import (
+    PolicyStateData, EnforcementDecision, evaluate_policy_batch,
+    initial_state, MODE_STATES, MODE_CODES, _policy_kernel, _policy_outputs
+)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WindowRecord:
     """
     Record of policy state and decision for a single window.
@@ -35,6 +41,82 @@ class WindowRecord:
         assert self.T_w >= 0, f"Invalid T_w: {self.T_w}"
 
 
+class HistoryColumns(NamedTuple):
+    """
+    Window history in columnar form: element i of every column describes
+    window i (the window index is the position).
+    
+    Carries the same information as a List[WindowRecord] without one
+    object per window. Columns are arrays ('q'/'b'), or read-only
+    memoryviews of them in ReplayOutput; both compare and iterate alike.
+    """
+    U_w: Union[array, memoryview]      # 'q': observed usage
+    T_w: Union[array, memoryview]      # 'q': enforced quota for next window
+    mode: Union[array, memoryview]     # 'b': MODE_STATES code at START of window
+    debt_us: Union[array, memoryview]  # 'q': debt at START of window
+
+
+class WindowHistory(Sequence):
+    """
+    Read-only view of window history that builds WindowRecords on access.
+    
+    Wraps history columns without copying them. The view is fixed to the
+    windows recorded when it was created; history is append-only, so
+    later windows never show up in (or alter) an existing view.
+    
+    Compares equal to any sequence of the same WindowRecords.
+    """
+    
+    __slots__ = ("_columns", "_length")
+    
+    def __init__(self, columns: HistoryColumns, length: int):
+        self._columns = columns
+        self._length = length
+        
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("window history index out of range")
+        
+        columns = self._columns
+        return _window_record(
+            index, columns.U_w[index], columns.T_w[index],
+            columns.mode[index], columns.debt_us[index]
+        )
+    
+    def __iter__(self) -> Iterator[WindowRecord]:
+        rows = zip(*self._columns)
+        for window_index, (U_w, T_w, mode, debt_us) in enumerate(islice(rows, self._length)):
+            yield _window_record(window_index, U_w, T_w, mode, debt_us)
+            
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"WindowHistory(<{self._length} windows>)"
+
+
+def _window_record(window_index: int, U_w: int, T_w: int, mode: int, debt_us: int) -> WindowRecord:
+    """Build the WindowRecord for one row of history columns."""
+    return WindowRecord(
+        window_index=window_index,
+        state=PolicyStateData(mode=MODE_STATES[mode], debt_us=debt_us, last_decision_time=0.0),
+        U_w=U_w,
+        T_w=T_w
+    )
+
+
 class WindowOrchestrator:
     """
     Pure window advancement orchestrator.
@@ -56,22 +138,47 @@ class WindowOrchestrator:
     - No decision making (only sequencing)
     """
     
-    def __init__(self, B: int, W: int):
+    def __init__(self, B: int, W: int, records: bool = True, history: bool = True, strict: bool = True):
         """
         Initialize orchestrator.
         
         Args:
             B: Declared budget (microseconds per window)
             W: Enforcement window size (symbolic constant, microseconds)
+            records: Have advance_window return a DecisionRecord. Pass False
+                when nothing logs or inspects decisions (the record slot is
+                then None).
+            history: Keep per-window history columns. Pass False for
+                open-ended runs that never read get_history(), so memory
+                stays constant however many windows are advanced.
+            strict: Check every policy output before it is recorded
+                (0 <= T_w <= B, history rows aligned with the window index).
+                Pass False to skip these checks in long bulk runs whose
+                policy output has already been verified.
         """
         assert B > 0, f"Invalid budget: B={B}"
         assert W > 0, f"Invalid window size: W={W}"
         
         self._B = B
         self._W = W  # T1: Fixed window size (constant)
+        self._records = records
+        self._keep_history = history
+        self._strict = strict
         self._window_index = 0
-        self._policy_state = initial_state()
-        self._history: List[WindowRecord] = []
+        
+        # Policy state at the start of the next window, kept as the encoded
+        # (mode, debt_us) pair _policy_kernel steps; PolicyStateData is only
+        # built for callers (advance_window's return, get_current_state).
+        state = initial_state()
+        self._mode = MODE_CODES[state.mode]
+        self._debt = state.debt_us
+        
+        # History columns (see HistoryColumns); WindowRecords are only
+        # built when get_history() is called.
+        self._history_U_w = array('q')
+        self._history_T_w = array('q')
+        self._history_mode = array('b')
+        self._history_debt = array('q')
     
     def advance_window(self, U_w: int) -> Tuple[PolicyStateData, EnforcementDecision, 'DecisionRecord']:
         """
@@ -83,7 +190,8 @@ class WindowOrchestrator:
             U_w: Observed CPU usage for this window (microseconds)
         
         Returns:
-            Tuple of (next_policy_state, enforcement_decision, decision_record)
+            Tuple of (next_policy_state, enforcement_decision, decision_record);
+            decision_record is None if the orchestrator was built with records=False
         
         Invariants:
             - T2: Policy evaluated exactly once per window
@@ -91,36 +199,116 @@ class WindowOrchestrator:
         """
         assert U_w >= 0, f"Invalid U_w: {U_w}"
         
+        mode = self._mode  # state at START of window
+        debt = self._debt
+        
         # T2: Evaluate policy exactly once per window
-        next_state, decision, record = evaluate_policy(
-            state=self._policy_state,
-            U_w=U_w,
-            B=self._B,
-            W=self._W
-        )
+        new_mode, new_debt, T_w, rule = _policy_kernel(mode, debt, U_w, self._B)
+        
+        if self._strict:
+            assert 0 <= T_w <= self._B, f"Invalid T_w: {T_w} (B={self._B})"
+            assert not self._keep_history or len(self._history_U_w) == self._window_index, \
+                f"History out of step with window index {self._window_index}"
         
         # Record this window (for logging/replay per SPEC.md §6.2)
-        window_record = WindowRecord(
-            window_index=self._window_index,
-            state=self._policy_state,  # state at START of window
-            U_w=U_w,
-            T_w=decision.T_w
-        )
-        self._history.append(window_record)
+        if self._keep_history:
+            self._history_U_w.append(U_w)
+            self._history_T_w.append(T_w)
+            self._history_mode.append(mode)
+            self._history_debt.append(debt)
         
         # Update state for next window
-        self._policy_state = next_state
+        self._mode = new_mode
+        self._debt = new_debt
         self._window_index += 1
         
-        return next_state, decision, record
+        # The start-of-window state is only reified for the DecisionRecord
+        state = None
+        if self._records:
+            state = PolicyStateData(mode=MODE_STATES[mode], debt_us=debt, last_decision_time=0.0)
+        return _policy_outputs(state, U_w, self._B, new_mode, new_debt, T_w, rule, self._records)
+    
+    def run_batch(self, observations: Sequence) -> None:
+        """
+        Advance one window per observation, in order.
+        
+        Same result as calling advance_window(U_w) for each observation, but
+        the policy runs in one batched pass and history columns are extended
+        in bulk. No per-window decisions are returned; read them back with
+        get_history() / get_history_arrays().
+        
+        Args:
+            observations: Observed CPU usage per window (microseconds)
+        
+        Invariants:
+            - T2: Policy evaluated exactly once per window, in order
+        """
+        if not observations:
+            return
+        
+        modes, debts, T_ws = evaluate_policy_batch(self.get_current_state(), observations, self._B)
+        
+        if self._strict:
+            # One C-level scan per bound instead of a check per window
+            assert min(T_ws) >= 0 and max(T_ws) <= self._B, \
+                f"Invalid T_w range: [{min(T_ws)}, {max(T_ws)}] (B={self._B})"
+            assert len(T_ws) == len(observations), \
+                f"Policy returned {len(T_ws)} decisions for {len(observations)} windows"
+            assert not self._keep_history or len(self._history_U_w) == self._window_index, \
+                f"History out of step with window index {self._window_index}"
+        
+        # Record these windows (state columns hold the state at START of each window)
+        if self._keep_history:
+            self._history_U_w.extend(observations)
+            self._history_T_w.extend(T_ws)
+            self._history_mode.append(self._mode)
+            self._history_mode.extend(modes[:-1])
+            self._history_debt.append(self._debt)
+            self._history_debt.extend(debts[:-1])
+        
+        # Update state for next window
+        self._mode = modes[-1]
+        self._debt = debts[-1]
+        self._window_index += len(observations)
     
-    def get_history(self) -> List[WindowRecord]:
+    def get_history(self) -> WindowHistory:
         """
         Get complete window history.
         
         Used for replay verification and logging per SPEC.md §6.2
+        
+        Returns a read-only view in O(1) (no copy); WindowRecords are built
+        as they are accessed. Empty if the orchestrator was built with
+        history=False. Prefer get_history_arrays() for bulk
+        comparison of long runs.
         """
-        return list(self._history)  # Return copy to prevent mutation
+        return WindowHistory(self._history_columns(), len(self._history_U_w))
+    
+    def get_history_arrays(self) -> HistoryColumns:
+        """
+        Get complete window history as columns (copies; safe to mutate).
+        
+        Used for replay verification per SPEC.md §6.2
+        """
+        return HistoryColumns(
+            U_w=array('q', self._history_U_w),
+            T_w=array('q', self._history_T_w),
+            mode=array('b', self._history_mode),
+            debt_us=array('q', self._history_debt)
+        )
+    
+    def _history_columns(self) -> HistoryColumns:
+        """
+        The live history columns themselves (no copy). For replay(), which
+        wraps them read-only and discards the orchestrator; anyone else
+        should use get_history_arrays().
+        """
+        return HistoryColumns(
+            U_w=self._history_U_w,
+            T_w=self._history_T_w,
+            mode=self._history_mode,
+            debt_us=self._history_debt
+        )
     
     def get_current_window_index(self) -> int:
         """Get current window index (for debugging/logging only)"""
@@ -128,4 +316,4 @@ class WindowOrchestrator:
     
     def get_current_state(self) -> PolicyStateData:
         """Get current policy state (for debugging/logging only)"""
-        return self._policy_state
+        return PolicyStateData(mode=MODE_STATES[self._mode], debt_us=self._debt, last_decision_time=0.0)
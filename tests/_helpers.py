@@ -0,0 +1,51 @@
+"""
+Shared assertions and stand-ins for tests.
+
+Spec Reference: INVARIANTS.md (P1, P2, P5)
+"""
+
+from itertools import compress
+
+from policy import MODE_NORMAL
+from window import HistoryColumns
+
+
+def check_all_invariants(columns: HistoryColumns, B: int) -> None:
+    """
+    Assert P1, P2 and P5 for every window of a columnar history
+    (e.g. ReplayOutput.columns).
+    
+    Each invariant is one reduction over the packed columns, so the cost
+    does not depend on building a WindowRecord per window.
+    """
+    debts = columns.debt_us
+    T_ws = columns.T_w
+    
+    # P1: debt >= 0
+    assert min(debts) >= 0, "P1 violated: negative debt"
+    
+    # P2: 0 <= T_w <= B
+    assert min(T_ws) >= 0 and max(T_ws) <= B, "P2 violated: T_w outside [0, B]"
+    
+    # P5: state == NORMAL => debt == 0
+    assert not any(compress(debts, map(MODE_NORMAL.__eq__, columns.mode))), \
+        "P5 violated: NORMAL window with debt"
+
+
+class RecordingLogger:
+    """
+    Stand-in for a logger that keeps what is logged: info() lines (trace
+    records) and warning() messages. Has no handlers, so
+    flush_json_logger() is a no-op on it.
+    """
+    
+    def __init__(self):
+        self.handlers = []
+        self.lines = []
+        self.warnings = []
+        
+    def info(self, msg, *args, **kwargs):
+        self.lines.append(msg)
+        
+    def warning(self, msg, *args, **kwargs):
+        self.warnings.append(msg)
@@ -1,15 +1,38 @@
 """
 Pytest fixtures for cgroup tests.
+
+Mock kernel directories are created once per session under pytest's
+managed temp directory and reset to the default kernel state before every
+test that uses them.
 """
 
 import pytest
 from .mock_kernel import MockKernel
 
+@pytest.fixture(scope="session")
+def mock_kernel_template(tmp_path_factory):
+    """One MockKernel for the whole session."""
+    kernel = MockKernel(tmp_path_factory.mktemp("cgroup"))
+    yield kernel
+    kernel.cleanup()
+
 @pytest.fixture
-def mock_kernel():
-    """Yields a MockKernel instance, cleaning up after."""
-    kernel = MockKernel()
-    try:
-        yield kernel
-    finally:
+def mock_kernel(mock_kernel_template):
+    """Yields the session MockKernel, reset to its default state."""
+    mock_kernel_template.reset()
+    return mock_kernel_template
+
+@pytest.fixture(scope="session")
+def mock_kernel_pair_template(tmp_path_factory):
+    """Two independent MockKernels for the whole session."""
+    kernels = (MockKernel(tmp_path_factory.mktemp("k1")), MockKernel(tmp_path_factory.mktemp("k2")))
+    yield kernels
+    for kernel in kernels:
         kernel.cleanup()
+
+@pytest.fixture
+def mock_kernel_pair(mock_kernel_pair_template):
+    """Yields two independent session MockKernels, reset to their default state."""
+    for kernel in mock_kernel_pair_template:
+        kernel.reset()
+    return mock_kernel_pair_template
@@ -9,26 +9,48 @@ Spec References:
 """
 
 import os
-import tempfile
-import shutil
+from itertools import count
+from typing import Callable
 
 class MockKernel:
     """
     Simulates a cgroup directory with cpu.stat and cpu.max.
+    
+    The orchestrator under test reads and writes the real files (its own
+    kernel I/O path stays exercised); simulated kernel state is also kept
+    in memory, so unchanged usage is not rewritten and each update is a
+    single positional write of a preformatted buffer on a persistent fd.
     """
     
-    def __init__(self):
-        self.root_dir = tempfile.mkdtemp(prefix="rgov_mock_cgroup_")
+    def __init__(self, root_dir):
+        """
+        Args:
+            root_dir: Existing directory to use as the cgroup root (e.g. from
+                pytest's tmp_path_factory, which also removes it).
+        """
+        self.root_dir = str(root_dir)
         self.cpu_stat = os.path.join(self.root_dir, "cpu.stat")
         self.cpu_max = os.path.join(self.root_dir, "cpu.max")
         
+        # Both files stay open for the kernel's lifetime: each update is a
+        # truncate + positional write, each read a positional read.
+        flags = os.O_RDWR | os.O_CREAT | os.O_TRUNC
+        self._stat_fd = os.open(self.cpu_stat, flags)
+        self._max_fd = os.open(self.cpu_max, flags)
+        
         # Initialize default kernel state
+        self.reset()
+        
+    def reset(self):
+        """Restore default kernel state (usage 0, no quota), rewriting both files."""
+        self.usage_usec = None  # files may have been edited directly; force the write
         self.set_usage(0)
         self.set_quota(None, 100_000)
         
     def cleanup(self):
-        """Remove temporary directory."""
-        shutil.rmtree(self.root_dir)
+        """Close the kernel files (the directory itself is left to its owner)."""
+        os.close(self._stat_fd)
+        os.close(self._max_fd)
         
     def path(self) -> str:
         """Return path to cgroup root."""
@@ -38,24 +60,27 @@ class MockKernel:
     
     def set_usage(self, usage_usec: int):
         """Simulate kernel updating cpu.stat."""
-        with open(self.cpu_stat, "w") as f:
-            # Matches format in read_cpu_usage
-            f.write(f"usage_usec {usage_usec}\n")
-            f.write("user_usec 0\n")
-            f.write("system_usec 0\n")
+        if usage_usec == self.usage_usec:
+            return  # file already holds this value
+        self.usage_usec = usage_usec
+        # Matches format in read_cpu_usage
+        self._write(self._stat_fd, f"usage_usec {usage_usec}\nuser_usec 0\nsystem_usec 0\n")
             
     def set_quota(self, quota: int | None, period: int):
         """Simulate explicit kernel state for quota (usually unnecessary as orchestrator writes it)."""
         q_str = "max" if quota is None else str(quota)
-        with open(self.cpu_max, "w") as f:
-            f.write(f"{q_str} {period}\n")
+        self._write(self._max_fd, f"{q_str} {period}\n")
+        
+    @staticmethod
+    def _write(fd: int, content: str):
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, content.encode(), 0)
             
     # --- Verification Methods ---
             
     def read_enforced_quota(self) -> tuple[int | None, int]:
         """Read what the orchestrator wrote to cpu.max."""
-        with open(self.cpu_max, "r") as f:
-            content = f.read().strip()
+        content = os.pread(self._max_fd, 64, 0).decode().strip()
         
         parts = content.split()
         if len(parts) != 2:
@@ -65,3 +90,13 @@ class MockKernel:
         period = int(period_str)
         quota = None if quota_str == "max" else int(quota_str)
         return quota, period
+
+
+def make_clock(start_ns: int = 1_000_000_000_000, step_ns: int = 10_000_000) -> Callable[[], int]:
+    """
+    Simulated monotonic clock for patching time.monotonic_ns.
+    
+    Each call returns the next tick (start_ns, start_ns + step_ns, ...) and
+    never runs out; step_ns=0 gives a frozen clock.
+    """
+    return count(start_ns, step_ns).__next__
@@ -4,17 +4,21 @@ Integration Tests for v1 Cgroup Orchestrator
 Verifies the full stack: Orchestrator -> Observer -> Policy -> Enforcer -> Mock Kernel.
 """
 
+import os
 import time
 import pytest
 from unittest.mock import patch, MagicMock
 
 from cgroup.orchestrator import CgroupOrchestrator
+from cgroup.timer import SleepWindowTimer, timerfd_available
 from policy import PolicyState
+from tests.cgroup.mock_kernel import make_clock
+from tests._helpers import RecordingLogger
 
 
 class TestOrchestration:
     
-    def test_basic_loop(self, mock_kernel):
+    def test_basic_loop(self, mock_kernel, monkeypatch):
         """Verify basic loop operation: usage read -> policy -> enforcement written."""
         # Setup
         cgroup_path = mock_kernel.path()
@@ -32,68 +36,58 @@ class TestOrchestration:
         #    Window 2 (150k). Debt 50k. Decision: Throttled (0). Enforce 0.
         #    Window 3 (0k). Debt 0 (paid down). Decision: Normal (B). Enforce B.
         
-        validation_errors = []
-        
         def sleep_side_effect(duration):
             # This is called AT THE START of each loop iteration (waiting for next window).
             # We can use this to update the mock kernel for the *upcoming* measurement
-            # and verify the *previous* enforcement.
+            # and verify the *previous* enforcement. A failed check raises out of
+            # run_loop immediately.
             
             nonlocal window_count
             window_count += 1
             
             # Read current enforcement (result of previous window)
-            try:
-                quota, period = mock_kernel.read_enforced_quota()
-                if window_count == 1:
-                    # Before Window 1 (Just started). 
-                    # Enforcement hasn't run yet, so it should be whatever MockKernel defaulted to (None/max)
-                    # or strictly, we don't care, but for this test we know it's None.
-                    if quota is not None: validation_errors.append(f"Window 1 Start: Expected None, got {quota}")
-                    # Update usage for Window 1: 50k
-                    mock_kernel.set_usage(50_000)
-                    
-                elif window_count == 2:
-                    # After Window 1. 50k usage. Under budget. State Normal. Enforce B.
-                    if quota != B: validation_errors.append(f"Window 2 Start: Expected {B}, got {quota}")
-                    # Update usage for Window 2: 50k -> 200k (Delta 150k)
-                    mock_kernel.set_usage(200_000)
-                    
-                elif window_count == 3:
-                     # After Window 2. 150k usage. Over budget. State Throttled. Enforce 0.
-                     if quota != 0: validation_errors.append(f"Window 3 Start: Expected 0, got {quota}")
-                     # Update usage for Window 3: 200k -> 200k (Delta 0)
-                     mock_kernel.set_usage(200_000)
-                     
-            except Exception as e:
-                validation_errors.append(str(e))
+            quota, period = mock_kernel.read_enforced_quota()
+            if window_count == 1:
+                # Before Window 1 (Just started). 
+                # Enforcement hasn't run yet, so it should be whatever MockKernel defaulted to (None/max)
+                # or strictly, we don't care, but for this test we know it's None.
+                assert quota is None, f"Window 1 Start: Expected None, got {quota}"
+                # Update usage for Window 1: 50k
+                mock_kernel.set_usage(50_000)
+                
+            elif window_count == 2:
+                # After Window 1. 50k usage. Under budget. State Normal. Enforce B.
+                assert quota == B, f"Window 2 Start: Expected {B}, got {quota}"
+                # Update usage for Window 2: 50k -> 200k (Delta 150k)
+                mock_kernel.set_usage(200_000)
+                
+            elif window_count == 3:
+                # After Window 2. 150k usage. Over budget. State Throttled. Enforce 0.
+                assert quota == 0, f"Window 3 Start: Expected 0, got {quota}"
+                # Update usage for Window 3: 200k -> 200k (Delta 0)
+                mock_kernel.set_usage(200_000)
 
         window_count = 0
         
-        # Mock time.time() is tricky because run_loop calls it multiple times.
-        # We can just return a monotonic sequence.
+        # Mock time.monotonic_ns() is tricky because run_loop calls it multiple times.
+        # We can just return a monotonic clock (10ms per read, never late).
         # And mock sleep() to trigger our side effect.
         
         # time values:
-        # Start: 1000
+        # Start: 1000s
         # Loop 1: sleep(check), wake, drift check
         # ...
         
-        time_sequence = [1000.0 + i*0.01 for i in range(100)] # Plenty of ticks
-        
-        with patch('time.time', side_effect=time_sequence):
-            with patch('time.sleep', side_effect=sleep_side_effect):
-                 orch.run_loop(max_windows=3)
+        monkeypatch.setattr('time.monotonic_ns', make_clock())
+        monkeypatch.setattr('time.sleep', sleep_side_effect)
+        orch.run_loop(max_windows=3)
         
         # Final check (After loop 3)
         # Usage 0. Debt paid. State Normal. Enforce B.
         quota, period = mock_kernel.read_enforced_quota()
-        if quota != B:
-             validation_errors.append(f"Final State: Expected {B}, got {quota}")
-             
-        assert not validation_errors, f"Validation errors: {validation_errors}"
+        assert quota == B, f"Final State: Expected {B}, got {quota}"
 
-    def test_drift_handling(self, mock_kernel):
+    def test_drift_handling(self, mock_kernel, monkeypatch):
         """Verify bounded drift handling: skip windows if very late."""
         cgroup_path = mock_kernel.path()
         B = 100_000
@@ -102,28 +96,25 @@ class TestOrchestration:
         orch = CgroupOrchestrator(cgroup_path, B, W_us)
         
         # Simulate a massive lag (2.5 windows)
-        start_time = 1000.0
-        with patch('time.time', side_effect=[
+        start_time = 1_000_000_000_000
+        late = start_time + 350_000_000
+        with patch('time.monotonic_ns', side_effect=[
             start_time,          # Init next_wake
-            start_time + 0.35,   # Sleep return (Late!)
-            start_time + 0.35,   # Wake
-            start_time + 0.35,   # Lag check (drift = 0.25)
-            # Realign Logic:
-            # lag = 0.25. missed = int(0.25/0.1) + 1 = 3?
-            # next_wake jumps.
-            start_time + 0.35    # Realign check time
+            late,                # Wake (Late! lag = 0.25s)
+            # Realign Logic (no sleep, no second read):
+            # boundaries at 0.2s and 0.3s also passed -> 2 skipped; next_wake = 0.4s.
         ]):
             with patch('time.sleep'):
                 # We expect warning logs about drift
-                with patch('cgroup.orchestrator.logger') as mock_logger:
-                    mock_kernel.set_usage(10_000)
-                    orch.run_loop(max_windows=1)
-                    
-                    # Verify warning
-                    assert mock_logger.warning.call_count >= 1
-                    args = mock_logger.warning.call_args_list[0][0][0]
-                    # Check for keywords from implementation
-                    assert "drift detected" in args or "skipped windows" in args
+                recorder = RecordingLogger()
+                monkeypatch.setattr('cgroup.orchestrator.logger', recorder)
+                mock_kernel.set_usage(10_000)
+                orch.run_loop(max_windows=1)
+                
+                # Verify warnings: the drift itself, then the skipped windows
+                assert len(recorder.warnings) == 2
+                assert "Major drift detected: 250.00ms" in recorder.warnings[0]
+                assert "2 skipped windows" in recorder.warnings[1]
 
     def test_idempotency(self, mock_kernel):
         """Verify enforcement idempotency."""
@@ -149,3 +140,160 @@ class TestOrchestration:
         with open(mock_kernel.cpu_max, "r") as f:
             content = f.read().strip()
         assert content == "max 100000"
+
+    def test_persistent_writer_overwrites(self, mock_kernel):
+        """Verify the persistent cpu.max writer fully replaces previous content."""
+        from cgroup.cpu import CpuQuotaWriter
+        writer = CpuQuotaWriter(mock_kernel.path())
+        
+        try:
+            # Longer value followed by shorter value must not leave residue
+            writer.write(100_000, 100_000)
+            writer.write(0, 100_000)
+            assert mock_kernel.read_enforced_quota() == (0, 100_000)
+            
+            writer.write(None, 100_000)
+            assert mock_kernel.read_enforced_quota() == (None, 100_000)
+        finally:
+            writer.close()
+            
+    def test_persistent_observer_sees_updates(self, mock_kernel):
+        """Verify a cached cpu.stat descriptor observes fresh kernel values."""
+        from cgroup.observation import WindowedObserver
+        observer = WindowedObserver(mock_kernel.path())
+        
+        try:
+            mock_kernel.set_usage(1_000)
+            observer.init_observation()
+            
+            mock_kernel.set_usage(51_000)
+            assert observer.measure_window() == 50_000
+            
+            mock_kernel.set_usage(51_500)
+            assert observer.measure_window() == 500
+        finally:
+            observer.close()
+            
+    def test_cpu_stat_parse_any_line_order(self, mock_kernel):
+        """Verify usage_usec is found even when it is not the first cpu.stat line."""
+        from cgroup.cpu import open_cpu_stat, read_cpu_usage_fd
+        with open(mock_kernel.cpu_stat, "w") as f:
+            f.write("user_usec 10\nsystem_usec 20\nusage_usec 30\n")
+            
+        fd = open_cpu_stat(mock_kernel.path())
+        try:
+            assert read_cpu_usage_fd(fd) == 30
+        finally:
+            os.close(fd)
+            
+    def test_cpu_stat_all_fields_one_read(self, mock_kernel):
+        """Verify every known cpu.stat field is parsed from one read."""
+        from cgroup.cpu import open_cpu_stat, read_cpu_stat_fd
+        with open(mock_kernel.cpu_stat, "w") as f:
+            f.write("usage_usec 30\nuser_usec 10\nsystem_usec 20\nnr_bursts 0\n")
+            
+        fd = open_cpu_stat(mock_kernel.path())
+        try:
+            stat = read_cpu_stat_fd(fd)
+        finally:
+            os.close(fd)
+            
+        assert stat.usage_usec == 30
+        assert stat.user_usec == 10
+        assert stat.system_usec == 20
+        assert stat.nr_throttled is None  # Absent, not defaulted
+        
+    def test_externally_driven_windows(self, mock_kernel):
+        """Verify process_window() runs a full window without run_loop's timing."""
+        B = 100_000
+        orch = CgroupOrchestrator(mock_kernel.path(), B, 100_000)
+        
+        try:
+            orch.start()
+            
+            mock_kernel.set_usage(150_000)  # Over budget
+            record = orch.process_window()
+            assert record.enforced_quota == 0
+            assert mock_kernel.read_enforced_quota() == (0, 100_000)
+            
+            mock_kernel.set_usage(150_000)  # Idle window pays down 50k debt
+            record = orch.process_window()
+            assert record.enforced_quota == B
+            assert mock_kernel.read_enforced_quota() == (B, 100_000)
+        finally:
+            orch.close()
+            
+    def test_unchanged_quota_not_rewritten(self, mock_kernel):
+        """Verify steady-state windows skip the redundant cpu.max write."""
+        B = 100_000
+        orch = CgroupOrchestrator(mock_kernel.path(), B, 100_000)
+        
+        try:
+            orch.start()
+            with patch.object(orch._enforcer, 'write', wraps=orch._enforcer.write) as mock_write:
+                for usage in (10_000, 20_000, 30_000):
+                    mock_kernel.set_usage(usage)  # 10k per window: under budget
+                    orch.process_window()
+                    
+                assert mock_write.call_count == 1
+            assert mock_kernel.read_enforced_quota() == (B, 100_000)
+        finally:
+            orch.close()
+            
+    @pytest.mark.skipif(not timerfd_available(), reason="timerfd requires Linux and Python 3.13+")
+    def test_timerfd_loop(self, mock_kernel):
+        """Verify the timerfd-driven loop evaluates one decision per window."""
+        B = 100_000
+        orch = CgroupOrchestrator(mock_kernel.path(), B, 1_000, use_timerfd=True)
+        
+        mock_kernel.set_usage(0)
+        orch.run_loop(max_windows=2)
+        
+        assert orch._policy_orch.get_current_window_index() == 2
+        assert mock_kernel.read_enforced_quota() == (B, 1_000)
+        
+    def test_timerfd_unavailable(self):
+        """Verify requesting timerfd on an unsupported platform fails loudly."""
+        with patch('cgroup.timer.timerfd_available', return_value=False):
+            with pytest.raises(RuntimeError, match="timerfd"):
+                CgroupOrchestrator("/unused", 100_000, 100_000, use_timerfd=True)
+                
+    def test_sleep_timer_counts_missed_windows(self):
+        """Verify a late wake returns at once, reports skips and stays on the W grid."""
+        timer = SleepWindowTimer(100_000)
+        start = 1_000_000_000_000
+        
+        with patch('time.monotonic_ns', side_effect=[
+            start,                  # start(): next_wake = start + 0.1s
+            start + 350_000_000,    # wait(): 0.25s late -> boundaries at 0.1, 0.2, 0.3 passed,
+                                    # no sleep; next_wake = start + 0.4s
+            start + 380_000_000,    # wait(): sleeps 0.02s to the boundary at 0.4s
+            start + 400_000_000,    # post-sleep read: on time
+        ]):
+            with patch('time.sleep') as mock_sleep:
+                timer.start()
+                assert timer.wait() == 3
+                assert timer.lag_ns == 250_000_000
+                mock_sleep.assert_not_called()
+                
+                assert timer.wait() == 1
+                assert timer.lag_ns == 0
+                
+        mock_sleep.assert_called_once_with(0.02)
+        
+    def test_sleep_timer_observes_oversleep(self):
+        """Verify lateness is measured after waking, so oversleep counts as drift."""
+        timer = SleepWindowTimer(100_000)
+        start = 1_000_000_000_000
+        
+        with patch('time.monotonic_ns', side_effect=[
+            start,                  # start(): next_wake = start + 0.1s
+            start + 50_000_000,     # wait(): sleeps 0.05s
+            start + 230_000_000,    # post-sleep read: overslept 0.13s past the boundary
+        ]):
+            with patch('time.sleep') as mock_sleep:
+                timer.start()
+                assert timer.wait() == 2    # boundary at 0.2s passed while asleep
+                
+        mock_sleep.assert_called_once_with(0.05)
+        assert timer.lag_ns == 130_000_000
@@ -0,0 +1,35 @@
+"""
+Pytest fixtures shared across test modules.
+"""
+
+import functools
+import time
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def generated():
+    """
+    Session-wide memo of observation generators.
+    
+    generated(generate_fn, **params) returns generate_fn(**params) as a
+    tuple, built once per distinct call and shared by every test that asks
+    for the same sequence (tuples, so no test can alter another's input).
+    """
+    @functools.lru_cache(maxsize=None)
+    def generate(generate_fn, **params):
+        return tuple(generate_fn(**params))
+    
+    return generate
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """
+    Make time.sleep a no-op, so window timers return immediately.
+    
+    Opt in per module with pytestmark = pytest.mark.usefixtures("no_sleep");
+    tests that script their own sleep behaviour should not use it.
+    """
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
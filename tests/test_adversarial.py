@@ -9,6 +9,8 @@ Spec References:
 """
 
 import pytest
+from array import array
+
 from replay import ReplayInput, replay
 from policy import PolicyState
 from generators import (
@@ -19,63 +21,83 @@ from generators import (
     generate_long_debt_accumulation,
     generate_oscillation
 )
+from tests._helpers import check_all_invariants
+
+
+# Segments shared by several scenarios, built once per module. Tuples, so a
+# test cannot mutate the cached copy another test sees.
+
+@pytest.fixture(scope="module")
+def zero_usage_5():
+    """Five idle windows (pays down up to 5 * B of debt)."""
+    return tuple(generate_zero_usage(num_windows=5))
+
+
+@pytest.fixture(scope="module")
+def exact_budget_10():
+    """Ten windows using exactly B = 100_000."""
+    return tuple(generate_boundary_conditions(B=100_000, num_windows=10))
+
+
+def _overshoot_replay(generated, overshoot_factor, num_windows):
+    """Replay a continuous-overshoot sequence at B = 100_000."""
+    observations = generated(
+        generate_continuous_overshoot,
+        B=100_000,
+        overshoot_factor=overshoot_factor,
+        num_windows=num_windows
+    )
+    
+    replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
+    return replay(replay_input)
+
+
+@pytest.fixture(scope="module")
+def overshoot_output(generated):
+    """One 2x continuous-overshoot replay (100 windows)."""
+    return _overshoot_replay(generated, overshoot_factor=2.0, num_windows=100)
+
+
+@pytest.fixture(scope="module")
+def mild_overshoot_output(generated):
+    """One 1.5x continuous-overshoot replay (50 windows)."""
+    return _overshoot_replay(generated, overshoot_factor=1.5, num_windows=50)
+
+
+@pytest.fixture(scope="module")
+def heavy_overshoot_output(generated):
+    """One 3x continuous-overshoot replay (20 windows)."""
+    return _overshoot_replay(generated, overshoot_factor=3.0, num_windows=20)
 
 
 class TestContinuousOvershoot:
     """Test continuous overshoot scenario per TESTING.md §5"""
     
-    def test_infinite_overshoot_accumulates_debt(self):
+    def test_infinite_overshoot_accumulates_debt(self, overshoot_output):
         """Continuous overshoot accumulates debt without bound"""
-        observations = generate_continuous_overshoot(
-            B=100_000,
-            overshoot_factor=2.0,
-            num_windows=100
-        )
-        
-        replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
-        output = replay(replay_input)
-        
         # Verify debt accumulates
         prev_debt = 0
-        for record in output.history:
+        for record in overshoot_output.history:
             current_debt = record.state.debt
             # Debt should monotonically increase
             assert current_debt >= prev_debt
             prev_debt = current_debt
         
         # Final debt should be substantial
-        final_debt = output.history[-1].state.debt
+        final_debt = overshoot_output.history[-1].state.debt
         assert final_debt > 0
     
-    def test_infinite_overshoot_maintains_throttled_state(self):
+    def test_infinite_overshoot_maintains_throttled_state(self, mild_overshoot_output):
         """Continuous overshoot keeps system in THROTTLED state"""
-        observations = generate_continuous_overshoot(
-            B=100_000,
-            overshoot_factor=1.5,
-            num_windows=50
-        )
-        
-        replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
-        output = replay(replay_input)
-        
         # After first window, should be throttled and stay throttled
-        for i, record in enumerate(output.history[1:], start=1):
-            assert record.state.state == PolicyState.THROTTLED, \
+        for i, record in enumerate(mild_overshoot_output.history[1:], start=1):
+            assert record.state.state is PolicyState.THROTTLED, \
                 f"Window {i} should be THROTTLED"
     
-    def test_infinite_overshoot_enforces_zero_quota(self):
+    def test_infinite_overshoot_enforces_zero_quota(self, heavy_overshoot_output):
         """Continuous overshoot results in T_w = 0"""
-        observations = generate_continuous_overshoot(
-            B=100_000,
-            overshoot_factor=3.0,
-            num_windows=20
-        )
-        
-        replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
-        output = replay(replay_input)
-        
         # After first window, T_w should be 0
-        for i, record in enumerate(output.history[1:], start=1):
+        for i, record in enumerate(heavy_overshoot_output.history[1:], start=1):
             assert record.T_w == 0, f"Window {i} should have T_w=0"
     
     def test_all_invariants_hold_under_continuous_overshoot(self):
@@ -90,22 +112,16 @@ class TestContinuousOvershoot:
         output = replay(replay_input)
         
         # Verify all invariants for every window
-        for record in output.history:
-            # P1: debt >= 0
-            assert record.state.debt >= 0
-            # P2: 0 <= T_w <= B
-            assert 0 <= record.T_w <= 100_000
-            # P5: state == NORMAL => debt == 0
-            if record.state.state == PolicyState.NORMAL:
-                assert record.state.debt == 0
+        check_all_invariants(output.columns, 100_000)
 
 
 class TestAlternatingOvershootUndershoot:
     """Test oscillation scenario per TESTING.md §5"""
     
-    def test_alternating_sequence_handles_debt_correctly(self):
+    def test_alternating_sequence_handles_debt_correctly(self, generated):
         """Alternating overshoot/undershoot handles debt accumulation and paydown"""
-        observations = generate_alternating_overshoot_undershoot(
+        observations = generated(
+            generate_alternating_overshoot_undershoot,
             B=100_000,
             overshoot_factor=2.0,
             undershoot_factor=0.5,
@@ -116,8 +132,7 @@ class TestAlternatingOvershootUndershoot:
         output = replay(replay_input)
         
         # Verify debt oscillates but remains bounded
-        for record in output.history:
-            assert record.state.debt >= 0  # P1
+        check_all_invariants(output.columns, 100_000)
     
     def test_alternating_with_equal_overshoot_undershoot(self):
         """Alternating with balanced over/under eventually stabilizes"""
@@ -131,7 +146,7 @@ class TestAlternatingOvershootUndershoot:
         output = replay(replay_input)
         
         # Debt should oscillate but not grow unbounded
-        max_debt = max(record.state.debt for record in output.history)
+        max_debt = max(output.columns.debt_us)
         assert max_debt < 100_000  # Should not exceed one window of overshoot
     
     def test_rapid_oscillation_preserves_invariants(self):
@@ -146,35 +161,43 @@ class TestAlternatingOvershootUndershoot:
         replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
         output = replay(replay_input)
         
-        for record in output.history:
-            # All invariants must hold
-            assert record.state.debt >= 0  # P1
-            assert 0 <= record.T_w <= 100_000  # P2
-            if record.state.state == PolicyState.NORMAL:
-                assert record.state.debt == 0  # P5
+        # All invariants must hold
+        check_all_invariants(output.columns, 100_000)
+    
+    def test_two_phase_generators_tile_their_pattern(self):
+        """Alternating and oscillating sequences are a repeated (high, low) pair"""
+        alternating = generate_alternating_overshoot_undershoot(
+            B=100_000, overshoot_factor=2.0, undershoot_factor=0.5, num_cycles=3
+        )
+        oscillation = generate_oscillation(
+            B=100_000, high_factor=3.0, low_factor=0.0, num_oscillations=3
+        )
+        
+        assert alternating == [200_000, 50_000] * 3
+        assert oscillation == [300_000, 0] * 3
 
 
 class TestZeroUsage:
     """Test zero usage scenario per TESTING.md §5"""
     
-    def test_zero_usage_from_clean_state(self):
+    def test_zero_usage_from_clean_state(self, generated):
         """Zero usage from clean state maintains NORMAL"""
-        observations = generate_zero_usage(num_windows=100)
+        observations = generated(generate_zero_usage, num_windows=100)
         
         replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
         output = replay(replay_input)
         
         # All windows should be NORMAL with zero debt
         for record in output.history:
-            assert record.state.state == PolicyState.NORMAL
+            assert record.state.state is PolicyState.NORMAL
             assert record.state.debt == 0
             assert record.T_w == 100_000  # Full budget
     
-    def test_zero_usage_pays_down_debt(self):
+    def test_zero_usage_pays_down_debt(self, zero_usage_5):
         """Zero usage pays down existing debt"""
         # First create debt, then zero usage
         observations = [200_000]  # Create 100k debt
-        observations.extend(generate_zero_usage(num_windows=5))
+        observations.extend(zero_usage_5)
         
         replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
         output = replay(replay_input)
@@ -192,23 +215,23 @@ class TestZeroUsage:
 class TestBoundaryConditions:
     """Test boundary conditions per TESTING.md §5"""
     
-    def test_exact_budget_usage_maintains_state(self):
+    def test_exact_budget_usage_maintains_state(self, generated):
         """Using exactly B maintains current state"""
-        observations = generate_boundary_conditions(B=100_000, num_windows=100)
+        observations = generated(generate_boundary_conditions, B=100_000, num_windows=100)
         
         replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
         output = replay(replay_input)
         
         # Should remain in NORMAL state with zero debt
         for record in output.history:
-            assert record.state.state == PolicyState.NORMAL
+            assert record.state.state is PolicyState.NORMAL
             assert record.state.debt == 0
     
-    def test_exact_budget_with_existing_debt(self):
+    def test_exact_budget_with_existing_debt(self, exact_budget_10):
         """Using exactly B with existing debt maintains debt"""
         # Create debt, then use exactly B
         observations = [150_000]  # Create 50k debt
-        observations.extend(generate_boundary_conditions(B=100_000, num_windows=10))
+        observations.extend(exact_budget_10)
         
         replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
         output = replay(replay_input)
@@ -237,7 +260,7 @@ class TestLongDebtAccumulation:
         output = replay(replay_input)
         
         # Find peak debt
-        peak_debt = max(record.state.debt for record in output.history)
+        peak_debt = max(output.columns.debt_us)
         assert peak_debt > 0
         
         # Verify debt eventually decreases
@@ -257,9 +280,7 @@ class TestLongDebtAccumulation:
         output = replay(replay_input)
         
         # Even with massive debt, invariants must hold
-        for record in output.history:
-            assert record.state.debt >= 0  # P1
-            assert 0 <= record.T_w <= 100_000  # P2
+        check_all_invariants(output.columns, 100_000)
         
         # Debt should be very large
         final_debt = output.history[-1].state.debt
@@ -269,36 +290,30 @@ class TestLongDebtAccumulation:
 class TestAdversarialCombinations:
     """Test combinations of adversarial scenarios"""
     
-    def test_overshoot_then_zero_then_overshoot(self):
+    def test_overshoot_then_zero_then_overshoot(self, zero_usage_5):
         """Overshoot → zero usage → overshoot again"""
-        observations = []
+        observations = array('q')  # same packed layout the generators return
         observations.extend(generate_continuous_overshoot(B=100_000, overshoot_factor=2.0, num_windows=10))
-        observations.extend(generate_zero_usage(num_windows=5))
+        observations.extend(zero_usage_5)
         observations.extend(generate_continuous_overshoot(B=100_000, overshoot_factor=3.0, num_windows=10))
         
         replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
         output = replay(replay_input)
         
         # All invariants must hold throughout
-        for record in output.history:
-            assert record.state.debt >= 0
-            assert 0 <= record.T_w <= 100_000
+        check_all_invariants(output.columns, 100_000)
     
-    def test_all_scenarios_combined(self):
+    def test_all_scenarios_combined(self, exact_budget_10):
         """Combination of all adversarial scenarios"""
-        observations = []
+        observations = array('q')  # same packed layout the generators return
         observations.extend(generate_continuous_overshoot(B=100_000, overshoot_factor=2.0, num_windows=20))
         observations.extend(generate_zero_usage(num_windows=10))
         observations.extend(generate_alternating_overshoot_undershoot(B=100_000, overshoot_factor=1.5, undershoot_factor=0.5, num_cycles=20))
-        observations.extend(generate_boundary_conditions(B=100_000, num_windows=10))
+        observations.extend(exact_budget_10)
         observations.extend(generate_oscillation(B=100_000, high_factor=5.0, low_factor=0.0, num_oscillations=20))
         
         replay_input = ReplayInput(B=100_000, W=100_000, observations=observations)
         output = replay(replay_input)
         
         # Verify all invariants hold throughout complex scenario
-        for record in output.history:
-            assert record.state.debt >= 0  # P1
-            assert 0 <= record.T_w <= 100_000  # P2
-            if record.state.state == PolicyState.NORMAL:
-                assert record.state.debt == 0  # P5
+        check_all_invariants(output.columns, 100_000)
@@ -8,13 +8,50 @@ Spec References:
 - TESTING.md §2.3 (Invariant Tests)
 """
 
+import functools
+import random
+import re
+
 import pytest
 from policy import (
     PolicyState, PolicyStateData, EnforcementDecision,
-    evaluate_policy, initial_state
+    evaluate_policy, evaluate_policy_batch, initial_state, MODE_CODES,
+    MODE_NORMAL, MODE_THROTTLED, _policy_kernel, _RULES
 )
 
 
+# Assertion messages raised by evaluate_policy's input guards
+INVALID_U_W = re.compile("Invalid input: U_w")
+INVALID_B = re.compile("Invalid input: B")
+
+
+def random_transitions(seed: int, count: int = 200):
+    """
+    Seeded random (state, U_w, B) draws and their evaluate_policy results.
+    
+    Yields (state, U_w, B, next_state, decision); a fixed seed gives the
+    same draws every run, so P1 and P2 are checked on identical inputs.
+    """
+    rng = random.Random(seed)
+    W = 100_000
+    
+    for _ in range(count):
+        mode = rng.choice(list(PolicyState))
+        debt = 0 if mode is PolicyState.NORMAL else rng.randint(1, 10**9)
+        state = PolicyStateData(mode=mode, debt_us=debt, last_decision_time=0.0)
+        U_w = rng.randint(0, 10**9)
+        B = rng.randint(1, 10**9)
+        
+        next_state, decision, _ = evaluate_policy(state, U_w, B, W)
+        yield state, U_w, B, next_state, decision
+
+
+@functools.lru_cache(maxsize=None)
+def throttled_state(debt_us: int) -> PolicyStateData:
+    """THROTTLED state carrying debt_us (shared instance; PolicyStateData is frozen)."""
+    return PolicyStateData(mode=PolicyState.THROTTLED, debt_us=debt_us, last_decision_time=0.0)
+
+
 class TestInvariantP1:
     """P1: debt >= 0 (non-negative debt)"""
     
@@ -23,44 +60,44 @@ class TestInvariantP1:
         state = initial_state()
         assert state.debt_us == 0
     
-    def test_debt_never_negative_after_overshoot(self):
-        """Debt remains non-negative after overshoot"""
-        state = initial_state()
+    @pytest.mark.parametrize("state, U_w", [
+        (initial_state(), 150_000),      # 50% overshoot from clean state
+        (throttled_state(10_000), 50_000),  # 50% undershoot with some debt
+    ], ids=["after_overshoot", "after_undershoot"])
+    def test_debt_never_negative(self, state, U_w):
+        """Debt remains non-negative after overshoot and after undershoot"""
         B = 100_000  # 100ms
         W = 100_000
-        U_w = 150_000  # 50% overshoot
-        
-        next_state, _, _ = evaluate_policy(state, U_w, B, W)
-        assert next_state.debt_us >= 0
-    
-    def test_debt_never_negative_after_undershoot(self):
-        """Debt remains non-negative after undershoot"""
-        # Start with some debt
-        state = PolicyStateData(mode=PolicyState.THROTTLED, debt_us=10_000, last_decision_time=0.0)
-        B = 100_000
-        W = 100_000
-        U_w = 50_000  # 50% undershoot
         
         next_state, _, _ = evaluate_policy(state, U_w, B, W)
         assert next_state.debt_us >= 0
     
     def test_debt_never_negative_with_large_undershoot(self):
         """Debt floors at 0 even with large undershoot"""
-        state = PolicyStateData(mode=PolicyState.THROTTLED, debt_us=10_000, last_decision_time=0.0)
+        state = throttled_state(10_000)
         B = 100_000
         W = 100_000
         U_w = 0  # Complete undershoot
         
         next_state, _, _ = evaluate_policy(state, U_w, B, W)
         assert next_state.debt_us == 0  # Should floor at 0, not go negative
+    
+    @pytest.mark.parametrize("seed", range(5))
+    def test_debt_never_negative_over_random_inputs(self, seed):
+        """Debt stays non-negative for seeded random (mode, debt, U_w, B) draws"""
+        for state, U_w, B, next_state, _ in random_transitions(seed):
+            assert next_state.debt_us >= 0, (state, U_w, B)
 
 
 class TestInvariantP2:
     """P2: 0 <= T_w <= B (budget bound)"""
     
-    def test_T_w_within_bounds_normal_state(self):
-        """T_w is within [0, B] in normal state"""
-        state = initial_state()
+    @pytest.mark.parametrize("state", [
+        initial_state(),
+        throttled_state(50_000),
+    ], ids=["normal_state", "throttled_state"])
+    def test_T_w_within_bounds(self, state):
+        """T_w is within [0, B] in normal and throttled state"""
         B = 100_000
         W = 100_000
         U_w = 50_000
@@ -68,15 +105,11 @@ class TestInvariantP2:
         _, decision, _ = evaluate_policy(state, U_w, B, W)
         assert 0 <= decision.T_w <= B
     
-    def test_T_w_within_bounds_throttled_state(self):
-        """T_w is within [0, B] in throttled state"""
-        state = PolicyStateData(mode=PolicyState.THROTTLED, debt_us=50_000, last_decision_time=0.0)
-        B = 100_000
-        W = 100_000
-        U_w = 50_000
-        
-        _, decision, _ = evaluate_policy(state, U_w, B, W)
-        assert 0 <= decision.T_w <= B
+    @pytest.mark.parametrize("seed", range(5))
+    def test_T_w_within_bounds_over_random_inputs(self, seed):
+        """T_w stays within [0, B] for the same seeded draws as P1"""
+        for state, U_w, B, _, decision in random_transitions(seed):
+            assert 0 <= decision.T_w <= B, (state, U_w, B)
     
     def test_T_w_equals_B_when_no_debt(self):
         """T_w equals B when debt is 0"""
@@ -91,7 +124,7 @@ class TestInvariantP2:
     def test_T_w_equals_zero_when_debt_exists(self):
         """T_w equals 0 when debt > 0"""
         # Use debt large enough that it won't be fully paid down
-        state = PolicyStateData(mode=PolicyState.THROTTLED, debt_us=60_000, last_decision_time=0.0)
+        state = throttled_state(60_000)
         B = 100_000
         W = 100_000
         U_w = 50_000  # 50k deficit, reduces debt to 10k
@@ -107,7 +140,7 @@ class TestInvariantP3:
     def test_no_throttling_at_start(self):
         """No throttling at initial state (debt = 0)"""
         state = initial_state()
-        assert state.mode == PolicyState.NORMAL
+        assert state.mode is PolicyState.NORMAL
     
     def test_throttling_only_after_overshoot(self):
         """Throttling occurs only after overshoot creates debt"""
@@ -118,20 +151,20 @@ class TestInvariantP3:
         # First window: undershoot, should remain NORMAL
         U_w = 50_000
         next_state, _, _ = evaluate_policy(state, U_w, B, W)
-        assert next_state.mode == PolicyState.NORMAL
+        assert next_state.mode is PolicyState.NORMAL
         assert next_state.debt_us == 0
         
         # Second window: overshoot, should transition to THROTTLED
         U_w = 150_000
         next_state, _, _ = evaluate_policy(next_state, U_w, B, W)
-        assert next_state.mode == PolicyState.THROTTLED
+        assert next_state.mode is PolicyState.THROTTLED
         assert next_state.debt_us > 0
     
     def test_throttling_is_function_of_debt(self):
         """Throttling is determined by debt, not current U_w"""
         # Even if current window is under budget, throttle if debt exists
         # Use larger debt so it's not fully paid down in one window
-        state = PolicyStateData(mode=PolicyState.THROTTLED, debt_us=60_000, last_decision_time=0.0)
+        state = throttled_state(60_000)
         B = 100_000
         W = 100_000
         U_w = 50_000  # Current window under budget (50k deficit)
@@ -140,42 +173,25 @@ class TestInvariantP3:
         # Debt reduced from 60k to 10k (60k - 50k deficit = 10k remaining)
         # Still throttled because debt still exists (though reduced)
         assert next_state.debt_us == 10_000
-        assert next_state.mode == PolicyState.THROTTLED
+        assert next_state.mode is PolicyState.THROTTLED
         assert decision.T_w == 0
 
 
 class TestInvariantP4:
     """P4: Debt decreases only when U_w < B"""
     
-    def test_debt_increases_on_overshoot(self):
-        """Debt increases when U_w > B"""
-        state = PolicyStateData(mode=PolicyState.THROTTLED, debt_us=10_000, last_decision_time=0.0)
-        B = 100_000
-        W = 100_000
-        U_w = 150_000  # Overshoot
-        
-        next_state, _, _ = evaluate_policy(state, U_w, B, W)
-        assert next_state.debt_us > state.debt_us
-    
-    def test_debt_decreases_on_undershoot(self):
-        """Debt decreases when U_w < B"""
-        state = PolicyStateData(mode=PolicyState.THROTTLED, debt_us=50_000, last_decision_time=0.0)
+    @pytest.mark.parametrize("state, U_w, expected_debt", [
+        (throttled_state(10_000), 150_000, 60_000),  # Overshoot: debt increases by 50k
+        (throttled_state(50_000), 50_000, 0),        # Undershoot: debt decreases by 50k
+        (throttled_state(50_000), 100_000, 50_000),  # Exact budget: debt unchanged
+    ], ids=["increases_on_overshoot", "decreases_on_undershoot", "unchanged_at_exact_budget"])
+    def test_debt_direction(self, state, U_w, expected_debt):
+        """Debt moves up when U_w > B, down when U_w < B, and not at all when U_w == B"""
         B = 100_000
         W = 100_000
-        U_w = 50_000  # Undershoot
         
         next_state, _, _ = evaluate_policy(state, U_w, B, W)
-        assert next_state.debt_us < state.debt_us
-    
-    def test_debt_unchanged_at_exact_budget(self):
-        """Debt unchanged when U_w == B"""
-        state = PolicyStateData(mode=PolicyState.THROTTLED, debt_us=50_000, last_decision_time=0.0)
-        B = 100_000
-        W = 100_000
-        U_w = 100_000  # Exact budget
-        
-        next_state, _, _ = evaluate_policy(state, U_w, B, W)
-        assert next_state.debt_us == state.debt_us
+        assert next_state.debt_us == expected_debt
 
 
 class TestInvariantP5:
@@ -184,13 +200,17 @@ class TestInvariantP5:
     def test_initial_state_is_normal_with_zero_debt(self):
         """Initial state is NORMAL with debt = 0"""
         state = initial_state()
-        assert state.mode == PolicyState.NORMAL
+        assert state.mode is PolicyState.NORMAL
         assert state.debt_us == 0
+        
+    def test_initial_state_is_shared(self):
+        """initial_state() hands out one immutable instance"""
+        assert initial_state() is initial_state()
     
     def test_transition_to_normal_only_when_debt_zero(self):
         """Transition to NORMAL only when debt reaches 0"""
         # Start with debt
-        state = PolicyStateData(mode=PolicyState.THROTTLED, debt_us=50_000, last_decision_time=0.0)
+        state = throttled_state(50_000)
         B = 100_000
         W = 100_000
         
@@ -199,7 +219,7 @@ class TestInvariantP5:
         next_state, _, _ = evaluate_policy(state, U_w, B, W)
         # Debt should be 0 now (50k debt - 100k deficit = 0)
         assert next_state.debt_us == 0
-        assert next_state.mode == PolicyState.NORMAL
+        assert next_state.mode is PolicyState.NORMAL
     
     def test_cannot_construct_normal_state_with_debt(self):
         """Cannot construct NORMAL state with debt > 0 (assertion should fail)"""
@@ -242,21 +262,66 @@ class TestInvariantP6:
         """Determinism holds across multiple windows"""
         observations = [50_000, 150_000, 75_000, 100_000, 0]
         B = 100_000
-        W = 100_000
         
-        # Run sequence twice
-        def run_sequence():
-            state = initial_state()
-            results = []
-            for U_w in observations:
-                state, decision, _ = evaluate_policy(state, U_w, B, W)
-                results.append((state, decision.T_w))
-            return results
+        W = 100_000
         
-        results1 = run_sequence()
-        results2 = run_sequence()
+        # Run sequence twice; each run yields packed (modes, debts, T_ws) columns
+        results1 = evaluate_policy_batch(initial_state(), observations, B)
+        results2 = evaluate_policy_batch(initial_state(), observations, B)
         
         assert results1 == results2
+        
+        # The batch equals folding evaluate_policy one window at a time
+        state = initial_state()
+        folded = ([], [], [])
+        for U_w in observations:
+            state, decision, _ = evaluate_policy(state, U_w, B, W)
+            folded[0].append(MODE_CODES[state.mode])
+            folded[1].append(state.debt_us)
+            folded[2].append(decision.T_w)
+        
+        assert tuple(map(list, results1)) == folded
+
+
+class TestPolicyKernel:
+    """The integer kernel produces the hand-computed transition for every rule"""
+    
+    @pytest.mark.parametrize("mode, debt_us, U_w, B, expected", [
+        # NORMAL: under, at and over budget
+        (MODE_NORMAL, 0, 50_000, 100_000, (MODE_NORMAL, 0, 100_000, "RULE_N1_UNDER_BUDGET")),
+        (MODE_NORMAL, 0, 100_000, 100_000, (MODE_NORMAL, 0, 100_000, "RULE_N1_UNDER_BUDGET")),
+        (MODE_NORMAL, 0, 150_000, 100_000, (MODE_THROTTLED, 50_000, 0, "RULE_N2_OVER_BUDGET")),
+        # THROTTLED: debt paid exactly, overpaid, partly paid, unchanged, grown
+        (MODE_THROTTLED, 50_000, 50_000, 100_000, (MODE_NORMAL, 0, 100_000, "RULE_T1_DEBT_RECOVERED")),
+        (MODE_THROTTLED, 10_000, 0, 100_000, (MODE_NORMAL, 0, 100_000, "RULE_T1_DEBT_RECOVERED")),
+        (MODE_THROTTLED, 60_000, 50_000, 100_000, (MODE_THROTTLED, 10_000, 0, "RULE_T2_STILL_IN_DEBT")),
+        (MODE_THROTTLED, 10_000, 100_000, 100_000, (MODE_THROTTLED, 10_000, 0, "RULE_T2_STILL_IN_DEBT")),
+        (MODE_THROTTLED, 10_000, 150_000, 100_000, (MODE_THROTTLED, 60_000, 0, "RULE_T2_STILL_IN_DEBT")),
+        # B = 0 (unchecked in the kernel; evaluate_policy rejects it)
+        (MODE_NORMAL, 0, 0, 0, (MODE_NORMAL, 0, 0, "RULE_N1_UNDER_BUDGET")),
+        (MODE_NORMAL, 0, 1, 0, (MODE_THROTTLED, 1, 0, "RULE_N2_OVER_BUDGET")),
+        (MODE_THROTTLED, 5, 0, 0, (MODE_THROTTLED, 5, 0, "RULE_T2_STILL_IN_DEBT")),
+    ], ids=[
+        "n1_under", "n1_at_budget", "n2_over",
+        "t1_paid_exactly", "t1_overpaid", "t2_partly_paid", "t2_at_budget", "t2_grown",
+        "b0_n1", "b0_n2", "b0_t2",
+    ])
+    def test_kernel_transitions(self, mode, debt_us, U_w, B, expected):
+        """_policy_kernel returns (mode, debt, T_w, rule) as computed by hand"""
+        new_mode, new_debt, T_w, rule = _policy_kernel(mode, debt_us, U_w, B)
+        
+        assert (new_mode, new_debt, T_w, _RULES[rule][0]) == expected
+    
+    def test_record_false_skips_only_the_record(self):
+        """record=False returns the same state and decision, with no record"""
+        state = throttled_state(60_000)
+        
+        next_state, decision, record = evaluate_policy(state, 50_000, 100_000, 100_000, record=False)
+        expected_state, expected_decision, _ = evaluate_policy(state, 50_000, 100_000, 100_000)
+        
+        assert record is None
+        assert next_state == expected_state
+        assert decision == expected_decision
 
 
 class TestInvariantAssertions:
@@ -272,7 +337,7 @@ class TestInvariantAssertions:
         B = 100_000
         W = 100_000
         
-        with pytest.raises(AssertionError, match="Invalid input: U_w"):
+        with pytest.raises(AssertionError, match=INVALID_U_W):
             evaluate_policy(state, U_w=-1, B=B, W=W)
     
     def test_invalid_budget_assertion(self):
@@ -280,5 +345,5 @@ class TestInvariantAssertions:
         state = initial_state()
         W = 100_000
         
-        with pytest.raises(AssertionError, match="Invalid input: B"):
+        with pytest.raises(AssertionError, match=INVALID_B):
             evaluate_policy(state, U_w=50_000, B=0, W=W)
@@ -14,14 +14,49 @@ import pytest
 import json
 import logging
 import time
-from unittest.mock import MagicMock, patch, mock_open
+from unittest.mock import MagicMock, mock_open
 from dataclasses import asdict
 
 from policy import DecisionRecord, PolicyStateData, PolicyState, initial_state, evaluate_policy
-from json_logger import setup_json_logger, log_decision
+from json_logger import setup_json_logger, log_decision, flush_json_logger
 from cgroup.orchestrator import CgroupOrchestrator
 from cgroup.orchestrator_v2 import MultiWorkloadOrchestrator
 from workload import WorkloadID
+from tests._helpers import RecordingLogger
+
+
+# Window timers return immediately (see tests/conftest.py)
+pytestmark = pytest.mark.usefixtures("no_sleep")
+
+
+class _StubObserver:
+    """Stand-in for WindowedObserver that reports a fixed usage every window."""
+    
+    def __init__(self, usage_us):
+        self.usage_us = usage_us
+        
+    def init_observation(self):
+        pass
+        
+    def measure_window(self):
+        return self.usage_us
+        
+    def close(self):
+        pass
+
+
+class _StubWriter:
+    """Stand-in for CpuQuotaWriter that discards writes."""
+    
+    def __init__(self, cgroup_path):
+        pass
+        
+    def write(self, T_w, W_us):
+        pass
+        
+    def close(self):
+        pass
+
 
 class TestJSONLogging:
     """Test JSON logging infrastructure"""
@@ -59,37 +94,78 @@ class TestJSONLogging:
         assert data['policy_rule_id'] == "TEST_RULE"
         assert data['state_before']['mode'] == "NORMAL" # Enum converted to string
         assert 'timestamp' in data
+        
+    def test_log_decision_matches_asdict_layout(self):
+        """Test that logged fields (names, order, values) mirror asdict(record)"""
+        mock_logger = MagicMock()
+        _, _, record = evaluate_policy(initial_state(), U_w=150_000, B=100_000, W=100_000)
+        
+        log_decision(mock_logger, record, override_window_index=7, timestamp=1.5)
+        
+        expected = asdict(record)
+        expected['window_index'] = 7
+        expected['state_before']['mode'] = "NORMAL"
+        expected['state_after']['mode'] = "THROTTLED"
+        expected['timestamp'] = 1.5
+        line = mock_logger.info.call_args[0][0]
+        assert line == json.dumps(expected, separators=(',', ':'))
+        
+    def test_buffered_records_written_on_flush(self, tmp_path):
+        """Test that buffered JSON lines reach the file once flushed"""
+        log_file = tmp_path / "trace.jsonl"
+        trace_logger = setup_json_logger(name="rgov.trace.test_flush", log_file=str(log_file), buffer_records=4)
+        
+        record = DecisionRecord(
+            window_index=None,
+            state_before=initial_state(),
+            debt_before=0,
+            usage_us=50_000,
+            budget_us=100_000,
+            enforced_quota=100_000,
+            state_after=initial_state(),
+            debt_after=0,
+            policy_rule_id="TEST_RULE",
+            violated_invariant=None
+        )
+        
+        try:
+            for i in range(5):
+                log_decision(trace_logger, record, override_window_index=i)
+                
+            # First batch of 4 written when the buffer filled; 5th still buffered
+            assert len(log_file.read_text().splitlines()) == 4
+            
+            flush_json_logger(trace_logger)
+            lines = log_file.read_text().splitlines()
+            assert [json.loads(line)['window_index'] for line in lines] == [0, 1, 2, 3, 4]
+        finally:
+            for handler in list(trace_logger.handlers):
+                handler.close()
+                trace_logger.removeHandler(handler)
 
 
 class TestV1Observability:
     """Test CgroupOrchestrator (v1) observability features"""
     
-    @patch('cgroup.orchestrator.WindowedObserver')
-    @patch('cgroup.orchestrator.write_cpu_quota')
-    @patch('cgroup.orchestrator.setup_json_logger')
-    def test_v1_logging_and_status(self, mock_setup_logger, mock_write, mock_observer_cls):
+    def test_v1_logging_and_status(self, monkeypatch):
         """Test v1 logging and get_status()"""
-        # Mock dependencies
-        mock_observer = mock_observer_cls.return_value
-        mock_observer.measure_window.return_value = 50_000
-        
-        mock_logger = MagicMock()
-        mock_setup_logger.return_value = mock_logger
+        # Stub dependencies
+        trace_logger = RecordingLogger()
+        monkeypatch.setattr('cgroup.orchestrator.WindowedObserver', lambda cgroup_path: _StubObserver(50_000))
+        monkeypatch.setattr('cgroup.orchestrator.CpuQuotaWriter', _StubWriter)
+        monkeypatch.setattr('cgroup.orchestrator.setup_json_logger', lambda **kwargs: trace_logger)
         
         # Init orchestrator
         orch = CgroupOrchestrator(cgroup_path="/test", B=100_000, W_us=100_000)
         
-        # Run 1 window
-        # We mock time.sleep to avoid delay
-        with patch('time.sleep'):
-            orch.run_loop(max_windows=1)
+        # Run 1 window (no_sleep avoids the delay)
+        orch.run_loop(max_windows=1)
             
         # Verify logging
         # orch._policy_orch index should be 1 locally (stats 0->1).
         # We logged with index 0.
-        mock_logger.info.assert_called()
-        last_log = mock_logger.info.call_args[0][0]
-        data = json.loads(last_log)
+        assert trace_logger.lines
+        data = json.loads(trace_logger.lines[-1])
         assert data['window_index'] == 0
         assert data['budget_us'] == 100_000
         
@@ -98,22 +174,43 @@ class TestV1Observability:
         assert state is not None
         assert record is not None
         assert record.usage_us == 50_000
+        
+    def test_v1_failed_window_flushes_trace(self, monkeypatch, tmp_path):
+        """Test that a window failing after it was logged still reaches the trace file"""
+        class _FailingWriter(_StubWriter):
+            def write(self, T_w, W_us):
+                raise OSError("cpu.max write failed")
+                
+        log_file = tmp_path / "trace.jsonl"
+        trace_logger = setup_json_logger(name="rgov.trace.test_v1_error", log_file=str(log_file))
+        monkeypatch.setattr('cgroup.orchestrator.WindowedObserver', lambda cgroup_path: _StubObserver(50_000))
+        monkeypatch.setattr('cgroup.orchestrator.CpuQuotaWriter', _FailingWriter)
+        monkeypatch.setattr('cgroup.orchestrator.setup_json_logger', lambda **kwargs: trace_logger)
+        
+        orch = CgroupOrchestrator(cgroup_path="/test", B=100_000, W_us=100_000)
+        try:
+            orch.start()
+            with pytest.raises(OSError, match="cpu.max"):
+                orch.process_window()
+                
+            lines = log_file.read_text().splitlines()
+            assert [json.loads(line)['window_index'] for line in lines] == [0]
+        finally:
+            for handler in list(trace_logger.handlers):
+                handler.close()
+                trace_logger.removeHandler(handler)
 
 
 class TestV2Observability:
     """Test MultiWorkloadOrchestrator (v2) observability features"""
     
-    @patch('cgroup.orchestrator_v2.WindowedObserver')
-    @patch('cgroup.orchestrator_v2.write_cpu_quota')
-    @patch('cgroup.orchestrator_v2.setup_json_logger')
-    def test_v2_logging_and_status(self, mock_setup_logger, mock_write, mock_observer_cls):
+    def test_v2_logging_and_status(self, monkeypatch):
         """Test v2 logging and get_status()"""
-        # Mock dependencies
-        mock_observer = mock_observer_cls.return_value
-        mock_observer.measure_window.return_value = 150_000 # Overshoot
-        
-        mock_logger = MagicMock()
-        mock_setup_logger.return_value = mock_logger
+        # Stub dependencies
+        trace_logger = RecordingLogger()
+        monkeypatch.setattr('cgroup.orchestrator_v2.WindowedObserver', lambda cgroup_path: _StubObserver(150_000)) # Overshoot
+        monkeypatch.setattr('cgroup.orchestrator_v2.CpuQuotaWriter', _StubWriter)
+        monkeypatch.setattr('cgroup.orchestrator_v2.setup_json_logger', lambda **kwargs: trace_logger)
         
         # Init orchestrator
         orch = MultiWorkloadOrchestrator(capacity_us=200_000, W_us=100_000)
@@ -121,13 +218,11 @@ class TestV2Observability:
         orch.register_workload(wid, "/test", 100_000)
         
         # Run 1 global window
-        with patch('time.sleep'):
-            orch.run_loop(max_windows=1)
+        orch.run_loop(max_windows=1)
             
         # Verify logging
-        mock_logger.info.assert_called()
-        last_log = mock_logger.info.call_args[0][0]
-        data = json.loads(last_log)
+        assert trace_logger.lines
+        data = json.loads(trace_logger.lines[-1])
         
         assert data['window_index'] == 0
         assert data['usage_us'] == 150_000
@@ -135,7 +230,7 @@ class TestV2Observability:
         
         # Verify get_status
         state, record = orch.get_status(wid)
-        assert state.mode == PolicyState.THROTTLED
+        assert state.mode is PolicyState.THROTTLED
         assert record is not None
         assert record.violated_invariant == "INV_USAGE_EXCEEDS_BUDGET"
 